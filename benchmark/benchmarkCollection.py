@@ -0,0 +1,272 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+"""
+    Throughput benchmark of DataSetCollector on synthetic data set trees.
+
+    Usage (from the repository root):
+        python -m benchmark.benchmarkCollection --sizes 1000 10000 100000 --output results.json
+        python -m benchmark.benchmarkCollection --sizes 1000 --baseline results.json
+
+    For every layout (type A / type B, see syntheticDataSets), size and collection method the benchmark reports
+    the number of data sets per second, percentiles of the latency of a single data set (for methods collecting
+    set by set) and the peak memory allocated by Python during the collection (measured in a separate run with
+    tracemalloc, as tracing slows the collection down). The results are written as JSON, so runs of different
+    versions can be compared with --baseline.
+"""
+
+import argparse
+import functools
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmark.syntheticDataSets import field_names, generate_type_a_tree, generate_type_b_tree, \
+    generate_synthetic_strings
+from compiledCollector import CompiledDataSetCollector, ROW_TUPLE
+from dataDescriptor import DataDescriptor, pass_through
+from dataSetCollector import DataSetCollector, get_data_sets_based_on_string_list
+
+TYPE_A = "typeA"
+TYPE_B = "typeB"
+SYNTHETIC = "synthetic"
+LAYOUTS = {TYPE_A: generate_type_a_tree, TYPE_B: generate_type_b_tree, SYNTHETIC: generate_synthetic_strings}
+PERCENTILES = (50, 90, 99)
+
+
+def read_file(file_path: str) -> str:
+    with open(file_path, 'r') as file:
+        return file.read()
+
+
+def read_data_file(directory: str) -> str:
+    return read_file(os.path.join(directory, "data.txt"))
+
+
+def read_field_file(directory: str, file_name: str) -> str:
+    return read_file(os.path.join(directory, file_name))
+
+
+def get_data_from_line_starting_with(file_content: str, what: str) -> str:
+    for line in file_content.split("\n"):
+        if line.startswith(what):
+            return line.split(":")[1][1:]
+    raise ValueError("Cannot find" + what + " in file")
+
+
+def pass_arg_down(arg):
+    return arg
+
+
+def count_letter(text: str, letter: str) -> str:
+    return str(text.count(letter))
+
+
+def collector_arguments(layout: str, fields: int) -> Tuple[Callable[..., Any], List[DataDescriptor]]:
+    """ the feeder and DataDescriptors used for collecting data sets of the layout, as in the tests """
+    descriptors = []
+    for name in field_names(fields):
+        transformation = int if name == "age" else pass_through
+        if layout == SYNTHETIC:
+            retrieving = functools.partial(count_letter, letter=name[0])
+        elif layout == TYPE_A:
+            retrieving = functools.partial(get_data_from_line_starting_with, what=name + ":")
+        else:
+            retrieving = functools.partial(read_field_file, file_name=name + ".txt")
+        descriptors.append(DataDescriptor(name, retrieving, transformation))
+    return (read_data_file if layout == TYPE_A else pass_arg_down), descriptors
+
+
+def _collect_set_by_set(function: Callable[[Any], Any], locations: List[str]) -> List[float]:
+    clock = time.perf_counter
+    latencies = []
+    for location in locations:
+        start = clock()
+        function(location)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def benchmark_data(feeder, descriptors, locations) -> Optional[List[float]]:
+    return _collect_set_by_set(DataSetCollector(feeder, descriptors).data, locations)
+
+
+def benchmark_data_list(feeder, descriptors, locations) -> Optional[List[float]]:
+    return _collect_set_by_set(DataSetCollector(feeder, descriptors).data_list, locations)
+
+
+def benchmark_get_data_sets(feeder, descriptors, locations) -> Optional[List[float]]:
+    get_data_sets_based_on_string_list(locations, feeder, descriptors)
+    return None
+
+
+def benchmark_compiled_data(feeder, descriptors, locations) -> Optional[List[float]]:
+    return _collect_set_by_set(CompiledDataSetCollector(feeder, descriptors).data, locations)
+
+
+def benchmark_compiled_data_sets(feeder, descriptors, locations) -> Optional[List[float]]:
+    CompiledDataSetCollector(feeder, descriptors).data_sets(locations)
+    return None
+
+
+def benchmark_compiled_tuple_data_sets(feeder, descriptors, locations) -> Optional[List[float]]:
+    CompiledDataSetCollector(feeder, descriptors, row_type=ROW_TUPLE).data_sets(locations)
+    return None
+
+
+METHODS = {
+    "data": benchmark_data,
+    "data_list": benchmark_data_list,
+    "get_data_sets_based_on_string_list": benchmark_get_data_sets,
+    "compiled_data": benchmark_compiled_data,
+    "compiled_data_sets": benchmark_compiled_data_sets,
+    "compiled_tuple_data_sets": benchmark_compiled_tuple_data_sets,
+}
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    return ordered[max(1, math.ceil(percent / 100 * len(ordered))) - 1]
+
+
+def run_benchmark(method: str, layout: str, locations: List[str], fields: int,
+                  measure_memory: bool = True) -> Dict[str, Any]:
+    """ collects all locations with the method, returning a single result record """
+    feeder, descriptors = collector_arguments(layout, fields)
+    benchmark = METHODS[method]
+
+    start = time.perf_counter()
+    latencies = benchmark(feeder, descriptors, locations)
+    seconds = time.perf_counter() - start
+
+    result = {
+        'method': method,
+        'layout': layout,
+        'sets': len(locations),
+        'fields': fields,
+        'seconds': seconds,
+        'sets_per_second': len(locations) / seconds if seconds else None,
+        'latency': None,
+        'peak_memory_bytes': None,
+    }
+    if latencies:
+        ordered = sorted(latencies)
+        result['latency'] = {'p' + str(percent): _percentile(ordered, percent) for percent in PERCENTILES}
+
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            benchmark(feeder, descriptors, locations)
+            result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(work_directory: str, sizes: List[int], layouts: List[str], methods: List[str], fields: int = 3,
+                   measure_memory: bool = True, report: Callable[[str], None] = lambda line: None) -> Dict[str, Any]:
+    """ generates the synthetic trees in work_directory and runs every method on every layout and size """
+    results = []
+    for layout in layouts:
+        for size in sizes:
+            root = os.path.join(work_directory, layout + "_" + str(size) + "_" + str(fields))
+            report("generating " + str(size) + " " + layout + " data sets in " + root)
+            locations = LAYOUTS[layout](root, size, fields)
+            for method in methods:
+                result = run_benchmark(method, layout, locations, fields, measure_memory)
+                report(format_result(result))
+                results.append(result)
+    return {
+        'python': sys.version,
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'results': results,
+    }
+
+
+def _result_key(result: Dict[str, Any]) -> Tuple:
+    return result['method'], result['layout'], result['sets'], result['fields']
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """ pairs results of the same benchmark from two runs, with the speedup of the current one (in sets per second) """
+    baseline_results = {_result_key(result): result for result in baseline['results']}
+    comparison = []
+    for result in current['results']:
+        previous = baseline_results.get(_result_key(result))
+        if previous is None or not previous['sets_per_second'] or not result['sets_per_second']:
+            continue
+        comparison.append({
+            'method': result['method'], 'layout': result['layout'], 'sets': result['sets'], 'fields': result['fields'],
+            'baseline_sets_per_second': previous['sets_per_second'],
+            'sets_per_second': result['sets_per_second'],
+            'speedup': result['sets_per_second'] / previous['sets_per_second'],
+        })
+    return comparison
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    line = "{layout:6} {sets:>8} sets  {method:36} {sets_per_second:12.1f} sets/s".format(**result)
+    if result['latency']:
+        line += "  p50 {:.1f}us p99 {:.1f}us".format(result['latency']['p50'] * 1e6, result['latency']['p99'] * 1e6)
+    if result['peak_memory_bytes'] is not None:
+        line += "  peak {:.1f} KiB".format(result['peak_memory_bytes'] / 1024)
+    return line
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark of DataSetCollector on synthetic data set trees.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000],
+                        help="numbers of data sets to generate (e.g. 1000 10000 100000 1000000)")
+    parser.add_argument("--layouts", nargs="+", choices=sorted(LAYOUTS), default=[TYPE_A, TYPE_B])
+    parser.add_argument("--methods", nargs="+", choices=list(METHODS), default=list(METHODS))
+    parser.add_argument("--fields", type=int, default=3, help="number of fields of every data set")
+    parser.add_argument("--work-directory", help="where to generate the trees (a temporary directory by default)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory measurement")
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--baseline", help="JSON file with results of a previous run to compare with")
+    arguments = parser.parse_args(argv)
+
+    def report(line: str):
+        print(line, file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        results = run_benchmarks(arguments.work_directory or temporary_directory, arguments.sizes, arguments.layouts,
+                                 arguments.methods, arguments.fields, not arguments.no_memory, report)
+
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline, 'r') as file:
+            baseline = json.load(file)
+        for entry in compare_results(baseline, results):
+            report("{layout:6} {sets:>8} sets  {method:36} {speedup:6.2f}x".format(**entry))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import os
+from typing import List
+
+SETS_PER_DIRECTORY = 1000
+
+
+def field_names(fields: int) -> List[str]:
+    """ names of the fields of synthetic data sets - name, surname, age and then field3, field4, ... """
+    base = ["name", "surname", "age"]
+    return base[:fields] + ["field" + str(i) for i in range(len(base), fields)]
+
+
+def field_value(field: str, index: int) -> str:
+    if field == "age":
+        return str(index % 100)
+    return field + "_" + str(index)
+
+
+def _set_directory(root: str, index: int) -> str:
+    # data sets are spread over sub-directories, so no directory holds more than SETS_PER_DIRECTORY entries
+    return os.path.join(root, str(index // SETS_PER_DIRECTORY), "set" + str(index))
+
+
+def generate_type_a_tree(root: str, count: int, fields: int = 3) -> List[str]:
+    """
+        Generates count data sets in the type A layout - a directory per data set with a single data.txt file holding
+        all fields as "field: value" lines. Returns the list of data set directories.
+    """
+    names = field_names(fields)
+    locations = []
+    for index in range(count):
+        directory = _set_directory(root, index)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "data.txt"), 'w') as file:
+            file.write("\n".join(name + ": " + field_value(name, index) for name in names))
+        locations.append(directory)
+    return locations
+
+
+def generate_type_b_tree(root: str, count: int, fields: int = 3) -> List[str]:
+    """
+        Generates count data sets in the type B layout - a directory per data set with a separate <field>.txt file for
+        every field. Returns the list of data set directories.
+    """
+    names = field_names(fields)
+    locations = []
+    for index in range(count):
+        directory = _set_directory(root, index)
+        os.makedirs(directory, exist_ok=True)
+        for name in names:
+            with open(os.path.join(directory, name + ".txt"), 'w') as file:
+                file.write(field_value(name, index))
+        locations.append(directory)
+    return locations
+
+
+def generate_synthetic_strings(root: str, count: int, fields: int = 3) -> List[str]:
+    """
+        Generates count in-memory data sets - short strings, as in the synthetic test of DataSetCollector. Nothing is
+        written to root; these data sets measure the overhead of the collector itself.
+    """
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return [letters[index % 26:] + letters[:index % 26 + fields] for index in range(count)]
@@ -0,0 +1,142 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+from array import array
+from typing import Any, List, Optional
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _plain_values(values: Any) -> Any:
+    # NumPy arrays are converted to plain Python values in one go
+    return values.tolist() if numpy is not None and isinstance(values, numpy.ndarray) else values
+
+
+class ListColumnBuffer:
+    """ column of values of any type, kept in a Python list """
+    def __init__(self):
+        self._values = []
+        self.append = self._values.append
+
+    def extend(self, values: Any):
+        self._values.extend(_plain_values(values))
+
+    def __len__(self):
+        return len(self._values)
+
+    def result(self) -> List[Any]:
+        return self._values
+
+
+class ArrayColumnBuffer:
+    """ column of numbers stored compactly in an array.array with the given typecode (e.g. 'q', 'd') """
+    def __init__(self, typecode: str):
+        self._values = array(typecode)
+        self.append = self._values.append
+
+    def extend(self, values: Any):
+        self._values.extend(_plain_values(values))
+
+    def __len__(self):
+        return len(self._values)
+
+    def result(self) -> array:
+        return self._values
+
+
+class NumpyColumnBuffer:
+    """
+        column stored in a NumPy array of the given dtype - values are written into preallocated chunks of chunk_size
+        elements, which are joined only once, when the result is requested
+    """
+    def __init__(self, dtype: Any, chunk_size: int):
+        if numpy is None:
+            raise ImportError("NumPy is required for NumPy column buffers")
+        if chunk_size < 1:
+            raise ValueError("chunk_size has to be a positive number, got: " + str(chunk_size))
+        self.dtype = numpy.dtype(dtype)
+        self.chunk_size = chunk_size
+        self._chunks = []
+        self._current = numpy.empty(0, dtype=self.dtype)
+        self._position = 0
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def append(self, value: Any):
+        if self._position == len(self._current):
+            self._current = numpy.empty(self.chunk_size, dtype=self.dtype)
+            self._chunks.append(self._current)
+            self._position = 0
+        self._current[self._position] = value
+        self._position += 1
+        self._length += 1
+
+    def extend(self, values: Any):
+        values = self._as_column(values)
+        written = 0
+        while written < len(values):
+            if self._position == len(self._current):
+                self._current = numpy.empty(self.chunk_size, dtype=self.dtype)
+                self._chunks.append(self._current)
+                self._position = 0
+            count = min(len(values) - written, len(self._current) - self._position)
+            self._current[self._position:self._position + count] = values[written:written + count]
+            self._position += count
+            written += count
+        self._length += len(values)
+
+    def _as_column(self, values: Any):
+        if self.dtype.kind != "O" or (isinstance(values, numpy.ndarray) and values.ndim == 1):
+            return numpy.asarray(values, dtype=self.dtype)
+        # element by element - asarray() would turn a column of equal-length sequences into a 2-D array
+        values = list(values)
+        column = numpy.empty(len(values), dtype=object)
+        for index, value in enumerate(values):
+            column[index] = value
+        return column
+
+    def result(self):
+        if not self._chunks:
+            return numpy.empty(0, dtype=self.dtype)
+        self._chunks[-1] = self._chunks[-1][:self._position]
+        result = numpy.concatenate(self._chunks)
+        self._chunks = [result]
+        self._current = result
+        self._position = len(result)
+        return result
+
+
+def create_column_buffer(dtype: Optional[Any], use_numpy: bool = False, chunk_size: int = 4096):
+    """
+        Creates a buffer for a column of values of the given dtype:
+            - with use_numpy - a NumpyColumnBuffer (values without dtype are stored as NumPy objects),
+            - otherwise - an ArrayColumnBuffer, where dtype has to be an array.array typecode,
+              or a ListColumnBuffer for values without dtype.
+    """
+    if use_numpy:
+        return NumpyColumnBuffer(object if dtype is None else dtype, chunk_size)
+    if dtype is None:
+        return ListColumnBuffer()
+    return ArrayColumnBuffer(dtype)
@@ -0,0 +1,134 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+from collections import namedtuple
+from typing import Any, Callable, Iterable, Iterator, List
+
+from dataDescriptor import DataDescriptor, pass_through
+
+ROW_DICT = "dict"
+ROW_TUPLE = "tuple"
+ROW_NAMEDTUPLE = "namedtuple"
+
+
+class FrozenDataDescriptor:
+    """ compact, immutable copy of a DataDescriptor - only its name and algorithms """
+    __slots__ = ("name", "data_retrieving_functor", "data_transformation_functor")
+
+    def __init__(self, name: str, data_retrieving_functor: Callable[..., Any],
+                 data_transformation_functor: Callable[[Any], Any]):
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "data_retrieving_functor", data_retrieving_functor)
+        object.__setattr__(self, "data_transformation_functor", data_transformation_functor)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("FrozenDataDescriptor is immutable")
+
+    def __reduce__(self):
+        return FrozenDataDescriptor, (self.name, self.data_retrieving_functor, self.data_transformation_functor)
+
+    def data(self, *args_for_data_retrieving_functor: ...) -> Any:
+        return self.data_transformation_functor(self.data_retrieving_functor(*args_for_data_retrieving_functor))
+
+
+def freeze(data_descriptor: DataDescriptor) -> FrozenDataDescriptor:
+    for feature in ("cache", "dependencies", "instrumentation"):
+        if getattr(data_descriptor, feature, None) not in (None, []):
+            raise ValueError("DataDescriptor " + data_descriptor.name + " uses " + feature +
+                             ", which is not supported by CompiledDataSetCollector")
+    return FrozenDataDescriptor(data_descriptor.name, data_descriptor.data_retrieving_functor,
+                                data_descriptor.data_transformation_functor)
+
+
+class CompiledDataSetCollector:
+    """
+        A low-overhead counterpart of DataSetCollector for workloads where the DataDescriptors are cheap, so the time
+        spent by the collector itself matters.
+
+        The list of DataDescriptors is frozen when the collector is created and a function specialized for exactly
+        these DataDescriptors is generated - it calls the feeder and all of the algorithms directly, without any loops,
+        temporary lists or calls of DataDescriptor.data(). Default (pass-through) transformations are skipped entirely.
+
+        Rows returned by data() depend on row_type:
+            - ROW_DICT ("dict") - a dictionary, like DataSetCollector.data(),
+            - ROW_TUPLE ("tuple") - a tuple of data in the order of the DataDescriptors,
+            - ROW_NAMEDTUPLE ("namedtuple") - a namedtuple (see row_class) with fields named after the DataDescriptors;
+              names which are not valid identifiers are replaced with positional names (_0, _1, ...).
+        data_list() always returns a list, like DataSetCollector.data_list().
+
+        Only plain synchronous DataDescriptors are supported - caches, dependencies and instrumentation are rejected.
+    """
+    def __init__(self,
+                 data_descriptors_feeder: Callable[..., Any],
+                 data_descriptors: List[DataDescriptor],
+                 row_type: str = ROW_DICT):
+        if row_type not in (ROW_DICT, ROW_TUPLE, ROW_NAMEDTUPLE):
+            raise ValueError("Unknown row type: " + str(row_type))
+        self.data_descriptors_feeder = data_descriptors_feeder
+        self.data_descriptors = tuple(freeze(data_descriptor) for data_descriptor in data_descriptors)
+        self.row_type = row_type
+        self.row_class = None
+        if row_type == ROW_NAMEDTUPLE:
+            self.row_class = namedtuple("DataSetRow", [data_descriptor.name for data_descriptor in self.data_descriptors],
+                                        rename=True)
+        self.data, self.data_list = self._compile()
+
+    def __reduce__(self):
+        # generated functions cannot be pickled - the collector is compiled again after unpickling
+        return CompiledDataSetCollector, (self.data_descriptors_feeder, list(self.data_descriptors), self.row_type)
+
+    def _compile(self):
+        namespace = {"feeder": self.data_descriptors_feeder, "Row": self.row_class}
+        expressions = []
+        for index, data_descriptor in enumerate(self.data_descriptors):
+            namespace["r" + str(index)] = data_descriptor.data_retrieving_functor
+            expression = "r" + str(index) + "(a)"
+            if data_descriptor.data_transformation_functor is not pass_through:
+                namespace["t" + str(index)] = data_descriptor.data_transformation_functor
+                expression = "t" + str(index) + "(" + expression + ")"
+            expressions.append(expression)
+
+        if self.row_type == ROW_DICT:
+            row = "{" + ", ".join(repr(data_descriptor.name) + ": " + expression
+                                  for data_descriptor, expression in zip(self.data_descriptors, expressions)) + "}"
+        elif self.row_type == ROW_TUPLE:
+            row = "(" + "".join(expression + ", " for expression in expressions) + ")"
+        else:
+            row = "Row(" + ", ".join(expressions) + ")"
+
+        source = ("def data(*args):\n"
+                  "    a = feeder(*args)\n"
+                  "    return " + row + "\n"
+                  "def data_list(*args):\n"
+                  "    a = feeder(*args)\n"
+                  "    return [" + ", ".join(expressions) + "]\n")
+        exec(compile(source, "<CompiledDataSetCollector>", "exec"), namespace)
+        return namespace["data"], namespace["data_list"]
+
+    def data_sets(self, data_locations: Iterable[Any]) -> List[Any]:
+        """ collects rows for every location from data_locations, in the same order """
+        data = self.data
+        return [data(data_location) for data_location in data_locations]
+
+    def iterate_data_sets(self, data_locations: Iterable[Any]) -> Iterator[Any]:
+        """ generator counterpart of data_sets() """
+        data = self.data
+        for data_location in data_locations:
+            yield data(data_location)
@@ -18,7 +18,23 @@
 #    SOFTWARE.
 #
 
-from typing import Callable, Any
+import inspect
+from typing import Callable, Any, Optional, List, Sequence
+from instrumentation import Instrumentation, RETRIEVAL_PHASE, TRANSFORMATION_PHASE, BATCH_RETRIEVAL_PHASE, \
+    BATCH_TRANSFORMATION_PHASE
+from lruCache import LruCache
+
+
+async def resolve(value: Any) -> Any:
+    """ awaits the value if it is awaitable (e.g. a result of an async algorithm), otherwise returns it untouched """
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+def pass_through(data: Any) -> Any:
+    """ default data transformation algorithm - returns the obtained data untouched """
+    return data
 
 
 class DataDescriptor:
@@ -37,15 +53,140 @@ class DataDescriptor:
             [2a] calling the data obtaining algorithm, passing to it any arguments provided to the data() member function,
             [2b] calling the data transformation algorithm on the obtained data.
             [2c] returning the obtained data after the transformation.
+
+        Both algorithms can also be asynchronous (coroutine functions or any functions returning awaitables) -
+        in that case use the data_async() member, which awaits their results. Plain synchronous algorithms work with
+        data_async() as well.
+
+        Optionally a LruCache can be passed - then data() memoizes its results, keyed on the arguments passed to it
+        (see LruCache). The cache must not be shared with DataDescriptors having different algorithms.
+        data_async() does not use the cache.
+
+        Optionally a list of dependencies - names of other DataDescriptors - can be passed. Such a DataDescriptor
+        is not fed by the data descriptors feeder of a DataSetCollector: its data obtaining algorithm gets values of
+        the dependencies instead, in the same order (see DataSetCollector).
+
+        Optionally a dtype of the data (after transformation) can be declared - an array.array typecode (e.g. 'q' for
+        integers, 'd' for floats) or a NumPy dtype. It is used for storing the data compactly when collecting many data
+        sets into columns (see DataSetCollector.data_columns).
+
+        Optionally an Instrumentation can be passed - then data() and data_async() measure durations of both
+        algorithms. The data_instrumented() and data_async_instrumented() members do the same with any given
+        Instrumentation - they are used by DataSetCollectors having their own Instrumentation.
+
+        Optionally a batch data obtaining algorithm can be passed - it gets a list of arguments for many data sets at
+        once (the argument of the data obtaining algorithm, or a tuple of arguments if there are more of them) and
+        returns a sequence of obtained data, one for every data set - e.g. a single database query for many records.
+        It is used by the data_batch() member; DataDescriptors without it fall back to obtaining data set by set.
+        With a cache, data_batch() serves the cached data sets from it and obtains only the rest with a single call
+        of the batch algorithm.
+
+        Similarly, a batch data transformation algorithm can be passed - it gets the whole column of obtained data
+        of a batch (a list) and returns a sequence of transformed data - e.g. a NumPy array computed with a single
+        vectorized operation instead of a Python call for every value. It has to give the same results as the data
+        transformation algorithm, which is still used by data() for single data sets. When it is used, data_batch()
+        does not use the cache.
     """
     def __init__(self,
                  name: str,
                  data_retrieving_functor: Callable[..., Any],
-                 data_transformation_functor: Callable[[Any], Any] = lambda d: d):
+                 data_transformation_functor: Callable[[Any], Any] = pass_through,
+                 cache: Optional[LruCache] = None,
+                 dependencies: Optional[List[str]] = None,
+                 dtype: Optional[Any] = None,
+                 instrumentation: Optional[Instrumentation] = None,
+                 batch_data_retrieving_functor: Optional[Callable[[List[Any]], Sequence[Any]]] = None,
+                 batch_data_transformation_functor: Optional[Callable[[List[Any]], Sequence[Any]]] = None):
         self.name = name
         self.data_retrieving_functor = data_retrieving_functor
         self.data_transformation_functor = data_transformation_functor
+        self.cache = cache
+        self.dependencies = dependencies
+        self.dtype = dtype
+        self.instrumentation = instrumentation
+        self.batch_data_retrieving_functor = batch_data_retrieving_functor
+        self.batch_data_transformation_functor = batch_data_transformation_functor
 
     def data(self, *args_for_data_retrieving_functor: ...) -> Any:
-        retrieved_data = self.data_retrieving_functor(*args_for_data_retrieving_functor)
-        return self.data_transformation_functor(retrieved_data)
+        if self.cache is None and self.instrumentation is None:
+            retrieved_data = self.data_retrieving_functor(*args_for_data_retrieving_functor)
+            return self.data_transformation_functor(retrieved_data)
+        return self.data_instrumented(self.instrumentation, *args_for_data_retrieving_functor)
+
+    def data_instrumented(self, instrumentation: Optional[Instrumentation], *args_for_data_retrieving_functor: ...) -> Any:
+        if self.cache is not None:
+            return self.cache.get_or_compute(args_for_data_retrieving_functor,
+                                             lambda: self._obtain(instrumentation, args_for_data_retrieving_functor))
+        return self._obtain(instrumentation, args_for_data_retrieving_functor)
+
+    def _obtain(self, instrumentation: Optional[Instrumentation], args_for_data_retrieving_functor: tuple) -> Any:
+        if instrumentation is None or not instrumentation.enabled:
+            retrieved_data = self.data_retrieving_functor(*args_for_data_retrieving_functor)
+            return self.data_transformation_functor(retrieved_data)
+        retrieved_data = instrumentation.measure(RETRIEVAL_PHASE, self.name, self.data_retrieving_functor,
+                                                 *args_for_data_retrieving_functor)
+        return instrumentation.measure(TRANSFORMATION_PHASE, self.name, self.data_transformation_functor, retrieved_data)
+
+    def data_batch(self, args_batch: Sequence[tuple], instrumentation: Optional[Instrumentation] = None) -> Sequence[Any]:
+        """
+            Obtains data for many data sets at once - args_batch holds a tuple of arguments for every data set.
+            Returns a sequence of data in the same order - a list, or whatever the batch data transformation algorithm
+            returns. With an Instrumentation, the batch algorithms are measured once for the whole batch, under
+            the batch phases (see Instrumentation).
+        """
+        if instrumentation is None:
+            instrumentation = self.instrumentation
+        if instrumentation is not None and not instrumentation.enabled:
+            instrumentation = None
+        if self.batch_data_retrieving_functor is None and self.batch_data_transformation_functor is None:
+            return [self.data_instrumented(instrumentation, *args) for args in args_batch]
+        if self.cache is not None and self.batch_data_transformation_functor is None:
+            return self.cache.get_or_compute_many(list(args_batch),
+                                                  lambda missing_args: self._obtain_batch(instrumentation, missing_args))
+        return self._obtain_batch(instrumentation, args_batch)
+
+    def _obtain_batch(self, instrumentation: Optional[Instrumentation], args_batch: Sequence[tuple]) -> Sequence[Any]:
+        if self.batch_data_retrieving_functor is None:
+            retrieving = self.data_retrieving_functor
+            retrieved_data = self._measure_batch(instrumentation, BATCH_RETRIEVAL_PHASE,
+                                                 lambda: [retrieving(*args) for args in args_batch])
+        else:
+            batch = [args[0] if len(args) == 1 else args for args in args_batch]
+            retrieved_data = self._measure_batch(instrumentation, BATCH_RETRIEVAL_PHASE,
+                                                 lambda: self.batch_data_retrieving_functor(batch))
+            self._check_batch_length("obtaining", retrieved_data, args_batch)
+
+        if self.batch_data_transformation_functor is None:
+            transformation = self.data_transformation_functor
+            return self._measure_batch(instrumentation, BATCH_TRANSFORMATION_PHASE,
+                                       lambda: [transformation(data) for data in retrieved_data])
+        transformed_data = self._measure_batch(instrumentation, BATCH_TRANSFORMATION_PHASE,
+                                               lambda: self.batch_data_transformation_functor(list(retrieved_data)))
+        self._check_batch_length("transformation", transformed_data, args_batch)
+        return transformed_data
+
+    def _measure_batch(self, instrumentation: Optional[Instrumentation], phase: str, functor: Callable[[], Any]) -> Any:
+        if instrumentation is None:
+            return functor()
+        return instrumentation.measure(phase, self.name, functor)
+
+    def _check_batch_length(self, algorithm: str, results: Sequence[Any], args_batch: Sequence[tuple]):
+        if len(results) != len(args_batch):
+            raise ValueError("Batch data " + algorithm + " algorithm of " + self.name + " returned " +
+                             str(len(results)) + " results for " + str(len(args_batch)) + " data sets")
+
+    async def data_async(self, *args_for_data_retrieving_functor: ...) -> Any:
+        if self.instrumentation is None:
+            retrieved_data = await resolve(self.data_retrieving_functor(*args_for_data_retrieving_functor))
+            return await resolve(self.data_transformation_functor(retrieved_data))
+        return await self.data_async_instrumented(self.instrumentation, *args_for_data_retrieving_functor)
+
+    async def data_async_instrumented(self, instrumentation: Optional[Instrumentation],
+                                      *args_for_data_retrieving_functor: ...) -> Any:
+        if instrumentation is None or not instrumentation.enabled:
+            retrieved_data = await resolve(self.data_retrieving_functor(*args_for_data_retrieving_functor))
+            return await resolve(self.data_transformation_functor(retrieved_data))
+        retrieved_data = await instrumentation.measure_async(RETRIEVAL_PHASE, self.name, self.data_retrieving_functor,
+                                                             *args_for_data_retrieving_functor)
+        return await instrumentation.measure_async(TRANSFORMATION_PHASE, self.name, self.data_transformation_functor,
+                                                   retrieved_data)
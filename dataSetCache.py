@@ -0,0 +1,182 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+def _listing(path: str):
+    """ yields (relative path, os.stat_result) for the path itself, or for every file under it if it is a directory """
+    if not os.path.isdir(path):
+        yield "", os.stat(path)
+        return
+    directories = [""]
+    while directories:
+        relative_directory = directories.pop()
+        with os.scandir(os.path.join(path, relative_directory)) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                relative_path = os.path.join(relative_directory, entry.name)
+                if entry.is_dir():
+                    directories.append(relative_path)
+                else:
+                    yield relative_path, entry.stat()
+
+
+def stat_fingerprint(path: str) -> str:
+    """
+        Cheap fingerprint of a file or of a whole directory tree, based on the modification times and sizes of the
+        files. Changes whenever any file is modified, added or removed.
+    """
+    digest = hashlib.sha256()
+    for relative_path, stat in _listing(path):
+        digest.update(repr((relative_path, stat.st_mtime_ns, stat.st_size)).encode())
+    return digest.hexdigest()
+
+
+def content_fingerprint(path: str) -> str:
+    """
+        Fingerprint of a file or of a whole directory tree, based on the content of the files. More expensive than
+        stat_fingerprint, but insensitive to touching the files without changing them.
+    """
+    digest = hashlib.sha256()
+    for relative_path, _ in _listing(path):
+        digest.update(repr(relative_path).encode())
+        with open(os.path.join(path, relative_path) if relative_path else path, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class DataSetCache:
+    """
+        Persistent, on-disk cache of data sets obtained by a DataSetCollector.
+
+        Every data set is stored in a separate file, identified by the location of the data set (arguments for
+        the data descriptors feeder). Together with the data, the cache stores:
+            - a fingerprint of the data source - obtained by calling the fingerprint algorithm with the location,
+            - a key of the DataDescriptors used for obtaining the data (their names) and the version of the cache.
+        A cached data set is used only if all of them are still the same, otherwise the data set is collected again
+        and the entry is replaced.
+
+        The DataDescriptors' algorithms cannot be compared between runs, so whenever they are changed without changing
+        the names of the DataDescriptors, the version should be changed too (or the cache cleared).
+
+        Workflow with this class should looks as follow:
+
+        [1] Creation: pass a directory for the cache files, the fingerprint algorithm (stat_fingerprint by default,
+            see also content_fingerprint) and optionally a version.
+        [2] Pass the cache to the DataSetCollector - it will be used by its data() and data_list() members.
+        [3] Check hits, misses or statistics() to see how much work was saved; call invalidate() with a location
+            or clear() to drop cached data sets.
+    """
+    def __init__(self,
+                 cache_directory: str,
+                 fingerprint: Callable[..., Hashable] = stat_fingerprint,
+                 version: str = ""):
+        self.cache_directory = cache_directory
+        self.fingerprint = fingerprint
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_directory, exist_ok=True)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _entry_path(self, location: tuple) -> str:
+        name = hashlib.sha256(repr(location).encode()).hexdigest()
+        return os.path.join(self.cache_directory, name[:2], name + ".pickle")
+
+    def _load(self, entry_path: str):
+        try:
+            with open(entry_path, 'rb') as file:
+                return pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, ValueError):
+            # damaged entry (e.g. a crash during writing) - treat it as missing, it will be overwritten
+            return None
+
+    def _store(self, entry_path: str, entry: Dict[str, Any]):
+        directory = os.path.dirname(entry_path)
+        os.makedirs(directory, exist_ok=True)
+        # write to a temporary file first, so readers never see a partially written entry
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, entry_path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    def get_or_collect(self, location: tuple, descriptors_key: Hashable, collect: Callable[[], Any]) -> Any:
+        """
+            Returns cached data for the location if it is still valid, otherwise calls collect(), caches and returns
+            its result.
+        """
+        entry_path = self._entry_path(location)
+        fingerprint = self.fingerprint(*location)
+        key = (descriptors_key, self.version)
+
+        entry = self._load(entry_path)
+        if entry is not None and entry['location'] == location and entry['fingerprint'] == fingerprint \
+                and entry['key'] == key:
+            with self._lock:
+                self.hits += 1
+            return entry['data']
+
+        with self._lock:
+            self.misses += 1
+        data = collect()
+        self._store(entry_path, {'location': location, 'fingerprint': fingerprint, 'key': key, 'data': data})
+        return data
+
+    def invalidate(self, *location) -> bool:
+        """ drops the cached data set of the location, returns whether there was anything to drop """
+        try:
+            os.unlink(self._entry_path(location))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def clear(self):
+        """ drops all cached data sets """
+        for directory, _, file_names in os.walk(self.cache_directory):
+            for file_name in file_names:
+                if file_name.endswith(".pickle"):
+                    os.unlink(os.path.join(directory, file_name))
+
+    def statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_ratio': hits / lookups if lookups else 0.0}
@@ -18,8 +18,104 @@
 #    SOFTWARE.
 #
 
-from typing import Callable, List, Any
-from dataDescriptor import DataDescriptor
+import asyncio
+import itertools
+import os
+import threading
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Callable, List, Any, Optional, Iterable, Iterator, Dict, Sequence
+from columnBuffers import create_column_buffer
+from dataDescriptor import DataDescriptor, resolve
+from dataSetCache import DataSetCache
+from instrumentation import Instrumentation, FEEDER_PHASE, BATCH_FEEDER_PHASE
+from lruCache import LruCache
+
+
+_descriptors_executor = None
+_descriptors_executor_lock = threading.Lock()
+
+
+def shared_descriptors_executor() -> ThreadPoolExecutor:
+    """
+        Returns the thread pool shared by all DataSetCollectors running their DataDescriptors concurrently.
+        The pool is created on the first use and reused for the whole lifetime of the process. A forked process
+        (e.g. a worker of the process executor) does not inherit it - it creates its own pool on the first use.
+    """
+    global _descriptors_executor
+    if _descriptors_executor is None:
+        with _descriptors_executor_lock:
+            if _descriptors_executor is None:
+                _descriptors_executor = ThreadPoolExecutor(thread_name_prefix="data_descriptors")
+    return _descriptors_executor
+
+
+def _forget_descriptors_executor():
+    # threads of the parent's pool do not exist in a forked child - the inherited pool would never run anything
+    global _descriptors_executor, _descriptors_executor_lock
+    _descriptors_executor = None
+    _descriptors_executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_descriptors_executor)
+
+
+def _evaluation_levels(data_descriptors: List[DataDescriptor],
+                       intermediates: List[DataDescriptor]) -> Optional[List[List[DataDescriptor]]]:
+    """
+        Orders the graph of DataDescriptors into levels - every DataDescriptor depends only on DataDescriptors from
+        the previous levels. Returns None if there are no dependencies at all, so the graph does not need to be used.
+    """
+    all_descriptors = list(intermediates) + list(data_descriptors)
+    if not intermediates and not any(data_descriptor.dependencies for data_descriptor in data_descriptors):
+        return None
+
+    by_name = {}
+    for data_descriptor in all_descriptors:
+        if data_descriptor.name in by_name:
+            raise ValueError("Duplicated DataDescriptor name: " + data_descriptor.name)
+        by_name[data_descriptor.name] = data_descriptor
+
+    depths = {}
+
+    def depth(data_descriptor: DataDescriptor, path: tuple) -> int:
+        if data_descriptor.name in depths:
+            return depths[data_descriptor.name]
+        if data_descriptor.name in path:
+            raise ValueError("Cyclic dependency between DataDescriptors: " +
+                             " -> ".join(path[path.index(data_descriptor.name):] + (data_descriptor.name,)))
+        result = 0
+        for dependency in data_descriptor.dependencies or []:
+            if dependency not in by_name:
+                raise ValueError("DataDescriptor " + data_descriptor.name + " depends on unknown DataDescriptor: " +
+                                 dependency)
+            result = max(result, depth(by_name[dependency], path + (data_descriptor.name,)) + 1)
+        depths[data_descriptor.name] = result
+        return result
+
+    levels = []
+    for data_descriptor in all_descriptors:
+        level = depth(data_descriptor, ())
+        levels.extend([] for _ in range(level + 1 - len(levels)))
+        levels[level].append(data_descriptor)
+    return levels
+
+
+def _descriptor_args(data_descriptor: DataDescriptor, data_descriptors_args: Any, values: Dict[str, Any]) -> tuple:
+    if data_descriptor.dependencies:
+        return tuple(values[dependency] for dependency in data_descriptor.dependencies)
+    return (data_descriptors_args,)
+
+
+def _as_list(column: Sequence[Any]) -> List[Any]:
+    """ converts a column returned by a batch algorithm (e.g. a NumPy array) into a list of plain Python values """
+    if isinstance(column, list):
+        return column
+    if hasattr(column, "tolist"):
+        return column.tolist()
+    return list(column)
 
 
 class DataSetCollector:
@@ -49,31 +145,545 @@ class DataSetCollector:
         Another example - when obtaining collection of data, stored as a content of some files inside some directory,
         algorithms for DataDescriptors should take as a parameter a path to the directory where all the files are stored,
         so the data descriptors feeder should return that path.
+
+        The data_async() and data_list_async() members are asynchronous counterparts of data() and data_list(): the
+        feeder and the DataDescriptors' algorithms may be asynchronous and all DataDescriptors of a single data set are
+        awaited concurrently. Synchronous algorithms can be mixed with asynchronous ones - they are simply called
+        in the event loop thread.
+
+        Passing concurrent_descriptors=True makes data() and data_list() run the DataDescriptors of a single data set
+        concurrently on a shared thread pool (see shared_descriptors_executor) - useful when every DataDescriptor
+        performs its own I/O, as then the time of obtaining a data set is close to the slowest DataDescriptor instead of
+        the sum of all of them. The results keep the order of the DataDescriptors.
+
+        Passing a DataSetCache makes data() and data_list() serve unchanged data sets from the cache and collect only
+        the new or changed ones (see DataSetCache). The asynchronous members do not use the cache. When the collector is
+        used with the process executor, every worker process updates its own copy of the cache statistics.
+
+        Passing a LruCache as feeder_cache memoizes the results of the data descriptors feeder in memory, keyed on
+        the arguments of data() / data_list() - useful when the same locations are collected many times in one process.
+        The same feeder_cache can be shared by many DataSetCollectors using the same feeder.
+        Results of single DataDescriptors can be memoized by passing a LruCache to them (see DataDescriptor).
+
+        DataDescriptors may depend on other DataDescriptors (see DataDescriptor.dependencies) - then the collector
+        evaluates them as a graph: every value is obtained once per data set and passed to all DataDescriptors depending
+        on it. Values which are only steps on the way (e.g. the content of a file parsed into a dictionary, shared by
+        many fields) should be described by intermediates - DataDescriptors which are evaluated, but not returned.
+        DataDescriptors without dependencies get the arguments from the data descriptors feeder, as usual.
+        The graph is built once, when the collector is created.
+
+        Passing an Instrumentation makes data(), data_list(), data_columns() and the asynchronous members measure
+        the durations of the feeder and of the algorithms of all DataDescriptors (see Instrumentation). Without it
+        nothing is measured and nothing is paid for it.
+
+        data_batch() and data_list_batch() collect many data sets at once. If a batch data descriptors feeder is given,
+        it is called once for the whole batch - it gets the list of locations and returns a sequence of arguments for
+        the DataDescriptors, one for every location (e.g. rows of a single "WHERE id IN (...)" query, made with
+        a connection from a ResourcePool). Otherwise the regular feeder is called for every location. Then every
+        DataDescriptor obtains its data for the whole batch (see DataDescriptor.data_batch). The batch members (and
+        data_columns(), which collects in batches too) do not use the DataSetCache.
+
+        data(), data_list(), data_lazy(), data_batch(), data_list_batch(), data_columns() and the asynchronous members
+        accept a projection - names of the DataDescriptors which should be collected, in the order in which they
+        should be returned. Only these DataDescriptors (and whatever they depend on) are evaluated, the rest is
+        skipped. Projected data sets are not stored in the DataSetCache.
+
+        data_lazy() goes one step further - it returns a LazyDataSet, a read-only mapping which calls the feeder and
+        the DataDescriptors only when their data is accessed for the first time.
     """
     def __init__(self,
                  data_descriptors_feeder: Callable[..., Any],
-                 data_descriptors: List[DataDescriptor]):
+                 data_descriptors: List[DataDescriptor],
+                 concurrent_descriptors: bool = False,
+                 cache: Optional[DataSetCache] = None,
+                 feeder_cache: Optional[LruCache] = None,
+                 intermediates: Optional[List[DataDescriptor]] = None,
+                 instrumentation: Optional[Instrumentation] = None,
+                 batch_data_descriptors_feeder: Optional[Callable[[List[Any]], Sequence[Any]]] = None):
         self.data_descriptors = data_descriptors
         self.data_descriptors_feeder = data_descriptors_feeder
+        self.concurrent_descriptors = concurrent_descriptors
+        self.cache = cache
+        self.feeder_cache = feeder_cache
+        self.intermediates = intermediates or []
+        self.instrumentation = instrumentation
+        self.batch_data_descriptors_feeder = batch_data_descriptors_feeder
+        self._evaluation_levels = _evaluation_levels(self.data_descriptors, self.intermediates)
+        self._names = tuple(data_descriptor.name for data_descriptor in self.data_descriptors)
+        # with none of the optional features used, data() and data_list() skip all of the checks below
+        self._direct = (cache is None and feeder_cache is None and instrumentation is None and
+                        self._evaluation_levels is None and not (concurrent_descriptors and len(data_descriptors) > 1))
+        self._projections = {}
+        self._outputs_by_name = {data_descriptor.name: data_descriptor for data_descriptor in self.data_descriptors}
+        self._descriptors_by_name = dict(self._outputs_by_name)
+        for intermediate in self.intermediates:
+            self._descriptors_by_name.setdefault(intermediate.name, intermediate)
+
+    def _projection(self, projection: Iterable[str]) -> "DataSetCollector":
+        """ returns a collector evaluating only the projected DataDescriptors and their dependencies """
+        names = tuple(projection)
+        collector = self._projections.get(names)
+        if collector is None:
+            collector = self._projections[names] = self._create_projection(names)
+        return collector
+
+    def _create_projection(self, names: tuple) -> "DataSetCollector":
+        for name in names:
+            if name not in self._outputs_by_name:
+                raise ValueError("Cannot project unknown DataDescriptor: " + name)
+
+        required = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name not in required:
+                required.add(name)
+                pending.extend(self._descriptors_by_name[name].dependencies or [])
+
+        all_descriptors = list(self.intermediates) + list(self.data_descriptors)
+        return DataSetCollector(data_descriptors_feeder=self.data_descriptors_feeder,
+                                data_descriptors=[self._outputs_by_name[name] for name in names],
+                                concurrent_descriptors=self.concurrent_descriptors,
+                                feeder_cache=self.feeder_cache,
+                                intermediates=[data_descriptor for data_descriptor in all_descriptors
+                                               if data_descriptor.name in required and data_descriptor.name not in names],
+                                instrumentation=self.instrumentation,
+                                batch_data_descriptors_feeder=self.batch_data_descriptors_feeder)
+
+    def data(self, *data_descriptors_feeder_args, projection: Optional[Iterable[str]] = None):
+        if projection is None and self._direct:
+            data_descriptors_args = self.data_descriptors_feeder(*data_descriptors_feeder_args)
+            return {data_descriptor.name: data_descriptor.data(data_descriptors_args)
+                    for data_descriptor in self.data_descriptors}
+        if projection is not None:
+            return self._projection(projection).data(*data_descriptors_feeder_args)
+        return dict(zip(self._names, self.data_list(*data_descriptors_feeder_args)))
+
+    def data_lazy(self, *data_descriptors_feeder_args, projection: Optional[Iterable[str]] = None) -> "LazyDataSet":
+        if projection is not None:
+            return self._projection(projection).data_lazy(*data_descriptors_feeder_args)
+        return LazyDataSet(self, data_descriptors_feeder_args)
+
+    def data_list(self, *data_descriptors_feeder_args, projection: Optional[Iterable[str]] = None):
+        if projection is None and self._direct:
+            data_descriptors_args = self.data_descriptors_feeder(*data_descriptors_feeder_args)
+            return [data_descriptor.data(data_descriptors_args) for data_descriptor in self.data_descriptors]
+        if projection is not None:
+            return self._projection(projection).data_list(*data_descriptors_feeder_args)
+        if self.cache is not None:
+            descriptors_key = (self._names,
+                               tuple(intermediate.name for intermediate in self.intermediates))
+            return self.cache.get_or_collect(data_descriptors_feeder_args, descriptors_key,
+                                             lambda: self._collect_list(data_descriptors_feeder_args))
+        return self._collect_list(data_descriptors_feeder_args)
+
+    def _feed(self, data_descriptors_feeder_args):
+        if self.feeder_cache is None and self.instrumentation is None:
+            return self.data_descriptors_feeder(*data_descriptors_feeder_args)
+        if self.feeder_cache is not None:
+            return self.feeder_cache.get_or_compute(data_descriptors_feeder_args,
+                                                    lambda: self._call_feeder(data_descriptors_feeder_args))
+        return self._call_feeder(data_descriptors_feeder_args)
 
-    def data(self, *data_descriptors_feeder_args):
-        data_descriptors_args = self.data_descriptors_feeder(*data_descriptors_feeder_args)
-        name_data_tuples = [
-            (data_descriptor.name, data_descriptor.data(data_descriptors_args))
-            for data_descriptor in self.data_descriptors
-        ]
-        return dict(name_data_tuples)
+    def _call_feeder(self, data_descriptors_feeder_args):
+        if self.instrumentation is None or not self.instrumentation.enabled:
+            return self.data_descriptors_feeder(*data_descriptors_feeder_args)
+        feeder_name = getattr(self.data_descriptors_feeder, "__name__", type(self.data_descriptors_feeder).__name__)
+        return self.instrumentation.measure(FEEDER_PHASE, feeder_name, self.data_descriptors_feeder,
+                                            *data_descriptors_feeder_args)
 
-    def data_list(self, *data_descriptors_feeder_args):
-        data_descriptors_args = self.data_descriptors_feeder(*data_descriptors_feeder_args)
+    def _descriptor_data(self, data_descriptor: DataDescriptor, *args_for_data_descriptor):
+        if self.instrumentation is None:
+            return data_descriptor.data(*args_for_data_descriptor)
+        return data_descriptor.data_instrumented(self.instrumentation, *args_for_data_descriptor)
+
+    def _collect_list(self, data_descriptors_feeder_args):
+        data_descriptors_args = self._feed(data_descriptors_feeder_args)
+        if self._evaluation_levels is not None:
+            return self._collect_graph(data_descriptors_args)
+        if self.concurrent_descriptors and len(self.data_descriptors) > 1:
+            executor = shared_descriptors_executor()
+            futures = [executor.submit(self._descriptor_data, data_descriptor, data_descriptors_args)
+                       for data_descriptor in self.data_descriptors]
+            return [future.result() for future in futures]
+        if self.instrumentation is not None:
+            return [data_descriptor.data_instrumented(self.instrumentation, data_descriptors_args)
+                    for data_descriptor in self.data_descriptors]
         return [data_descriptor.data(data_descriptors_args) for data_descriptor in self.data_descriptors]
 
+    def _collect_graph(self, data_descriptors_args):
+        values = {}
+        for level in self._evaluation_levels:
+            if self.concurrent_descriptors and len(level) > 1:
+                executor = shared_descriptors_executor()
+                futures = [executor.submit(self._descriptor_data, data_descriptor,
+                                           *_descriptor_args(data_descriptor, data_descriptors_args, values))
+                           for data_descriptor in level]
+                for data_descriptor, future in zip(level, futures):
+                    values[data_descriptor.name] = future.result()
+            else:
+                for data_descriptor in level:
+                    values[data_descriptor.name] = self._descriptor_data(
+                        data_descriptor, *_descriptor_args(data_descriptor, data_descriptors_args, values))
+        return [values[data_descriptor.name] for data_descriptor in self.data_descriptors]
+
+    def data_batch(self, data_locations: Iterable[Any],
+                   projection: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """ collects data sets for all of the locations at once, returning dictionaries in the order of the locations """
+        if projection is not None:
+            return self._projection(projection).data_batch(data_locations)
+        return [dict(zip(self._names, data)) for data in self.data_list_batch(data_locations)]
+
+    def data_list_batch(self, data_locations: Iterable[Any],
+                        projection: Optional[Iterable[str]] = None) -> List[List[Any]]:
+        """ collects data sets for all of the locations at once, returning lists in the order of the locations """
+        if projection is not None:
+            return self._projection(projection).data_list_batch(data_locations)
+        data_locations = list(data_locations)
+        columns = [_as_list(column) for column in self._collect_columns(data_locations)]
+        if not columns:
+            return [[] for _ in data_locations]
+        return [list(data) for data in zip(*columns)]
+
+    def iterate_data_in_batches(self, data_locations: Iterable[Any], batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+            Generator collecting data sets from any iterable of locations in batches of batch_size (see data_batch),
+            yielding dictionaries in the order of the locations.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size has to be a positive number, got: " + str(batch_size))
+        data_locations = iter(data_locations)
+        while True:
+            batch = list(itertools.islice(data_locations, batch_size))
+            if not batch:
+                return
+            yield from self.data_batch(batch)
+
+    def _feed_batch(self, data_locations: List[Any]) -> List[Any]:
+        if self.batch_data_descriptors_feeder is None:
+            return [self._feed((data_location,)) for data_location in data_locations]
+        if self.instrumentation is None or not self.instrumentation.enabled:
+            data_descriptors_args = self.batch_data_descriptors_feeder(data_locations)
+        else:
+            feeder_name = getattr(self.batch_data_descriptors_feeder, "__name__",
+                                  type(self.batch_data_descriptors_feeder).__name__)
+            data_descriptors_args = self.instrumentation.measure(BATCH_FEEDER_PHASE, feeder_name,
+                                                                 self.batch_data_descriptors_feeder, data_locations)
+        if len(data_descriptors_args) != len(data_locations):
+            raise ValueError("Batch data descriptors feeder returned " + str(len(data_descriptors_args)) +
+                             " results for " + str(len(data_locations)) + " locations")
+        return list(data_descriptors_args)
+
+    def _collect_columns(self, data_locations: List[Any]) -> List[List[Any]]:
+        """ collects data of all of the locations as columns - a list of data for every DataDescriptor """
+        args_batch = [(data_descriptors_args,) for data_descriptors_args in self._feed_batch(data_locations)]
+        if self._evaluation_levels is None:
+            return self._level_columns(self.data_descriptors, [args_batch] * len(self.data_descriptors))
+
+        columns = {}
+        for level in self._evaluation_levels:
+            level_args = [
+                list(zip(*[columns[dependency] for dependency in data_descriptor.dependencies]))
+                if data_descriptor.dependencies else args_batch
+                for data_descriptor in level
+            ]
+            columns.update(zip([data_descriptor.name for data_descriptor in level],
+                               self._level_columns(level, level_args)))
+        return [columns[data_descriptor.name] for data_descriptor in self.data_descriptors]
+
+    def _level_columns(self, data_descriptors: List[DataDescriptor], args_batches: List[List[tuple]]):
+        if self.concurrent_descriptors and len(data_descriptors) > 1:
+            executor = shared_descriptors_executor()
+            futures = [executor.submit(data_descriptor.data_batch, args_batch, self.instrumentation)
+                       for data_descriptor, args_batch in zip(data_descriptors, args_batches)]
+            return [future.result() for future in futures]
+        return [data_descriptor.data_batch(args_batch, self.instrumentation)
+                for data_descriptor, args_batch in zip(data_descriptors, args_batches)]
+
+    def data_columns(self, data_locations: Iterable[Any], use_numpy: bool = False, chunk_size: int = 4096,
+                     projection: Optional[Iterable[str]] = None):
+        """
+            Collects data sets for every location from data_locations (passed to the data descriptors feeder as a single
+            argument) directly into columns, without building a dictionary for every data set.
+
+            The locations are collected in batches of chunk_size (see data_batch), so batch feeders and batch algorithms
+            of the DataDescriptors are used if they are given - e.g. a vectorized batch data transformation algorithm
+            runs once for every chunk. Like the other batch members, it does not use the DataSetCache.
+
+            Returns a dictionary where the keys are the names of the DataDescriptors and the values are columns of
+            their data, in the order of the locations (see create_column_buffer):
+                - array.array for DataDescriptors with dtype, list for the other ones,
+                - or NumPy arrays when use_numpy is set - filled in chunks of chunk_size elements.
+        """
+        if projection is not None:
+            return self._projection(projection).data_columns(data_locations, use_numpy, chunk_size)
+        if chunk_size < 1:
+            raise ValueError("chunk_size has to be a positive number, got: " + str(chunk_size))
+        buffers = [create_column_buffer(data_descriptor.dtype, use_numpy, chunk_size)
+                   for data_descriptor in self.data_descriptors]
+        data_locations = iter(data_locations)
+        while True:
+            batch = list(itertools.islice(data_locations, chunk_size))
+            if not batch:
+                break
+            for buffer, column in zip(buffers, self._collect_columns(batch)):
+                buffer.extend(column)
+        return dict(zip(self._names, [buffer.result() for buffer in buffers]))
+
+    async def data_async(self, *data_descriptors_feeder_args, projection: Optional[Iterable[str]] = None):
+        if projection is not None:
+            return await self._projection(projection).data_async(*data_descriptors_feeder_args)
+        data = await self.data_list_async(*data_descriptors_feeder_args)
+        return dict(zip(self._names, data))
+
+    async def data_list_async(self, *data_descriptors_feeder_args, projection: Optional[Iterable[str]] = None):
+        if projection is not None:
+            return await self._projection(projection).data_list_async(*data_descriptors_feeder_args)
+        data_descriptors_args = await self._feed_async(data_descriptors_feeder_args)
+        if self._evaluation_levels is None:
+            return list(await asyncio.gather(*[
+                self._descriptor_data_async(data_descriptor, data_descriptors_args)
+                for data_descriptor in self.data_descriptors
+            ]))
+
+        values = {}
+        for level in self._evaluation_levels:
+            level_values = await asyncio.gather(*[
+                self._descriptor_data_async(data_descriptor,
+                                            *_descriptor_args(data_descriptor, data_descriptors_args, values))
+                for data_descriptor in level
+            ])
+            values.update(zip([data_descriptor.name for data_descriptor in level], level_values))
+        return [values[data_descriptor.name] for data_descriptor in self.data_descriptors]
+
+    async def _feed_async(self, data_descriptors_feeder_args):
+        if self.instrumentation is None or not self.instrumentation.enabled:
+            return await resolve(self.data_descriptors_feeder(*data_descriptors_feeder_args))
+        feeder_name = getattr(self.data_descriptors_feeder, "__name__", type(self.data_descriptors_feeder).__name__)
+        return await self.instrumentation.measure_async(FEEDER_PHASE, feeder_name, self.data_descriptors_feeder,
+                                                        *data_descriptors_feeder_args)
+
+    def _descriptor_data_async(self, data_descriptor: DataDescriptor, *args_for_data_descriptor):
+        if self.instrumentation is None:
+            return data_descriptor.data_async(*args_for_data_descriptor)
+        return data_descriptor.data_async_instrumented(self.instrumentation, *args_for_data_descriptor)
+
+
+_NOT_FED = object()
+
+
+class LazyDataSet(Mapping):
+    """
+        Read-only mapping of a single data set (see DataSetCollector.data_lazy) - the keys are the names of
+        the DataDescriptors, but their data is obtained only when it is accessed for the first time, and remembered.
+        The data descriptors feeder is called on the first access of any data. Accessing a DataDescriptor evaluates
+        also the DataDescriptors it depends on (once). Not thread-safe.
+    """
+    def __init__(self, collector: DataSetCollector, data_descriptors_feeder_args: tuple):
+        self._collector = collector
+        self._data_descriptors_feeder_args = data_descriptors_feeder_args
+        self._data_descriptors_args = _NOT_FED
+        self._values = {}
+
+    def __getitem__(self, name: str) -> Any:
+        data_descriptor = self._collector._outputs_by_name[name]
+        if name in self._values:
+            return self._values[name]
+        return self._evaluate(data_descriptor)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._collector._outputs_by_name)
+
+    def __len__(self) -> int:
+        return len(self._collector._outputs_by_name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._collector._outputs_by_name
+
+    def __repr__(self) -> str:
+        return "LazyDataSet(" + ", ".join(name + "=" + (repr(self._values[name]) if name in self._values else "...")
+                                          for name in self) + ")"
+
+    def evaluated(self) -> List[str]:
+        """ names of the DataDescriptors (also the intermediate ones) which were already evaluated """
+        return list(self._values)
+
+    def _evaluate(self, data_descriptor: DataDescriptor) -> Any:
+        if data_descriptor.dependencies:
+            args = tuple(self._dependency(dependency) for dependency in data_descriptor.dependencies)
+        else:
+            if self._data_descriptors_args is _NOT_FED:
+                self._data_descriptors_args = self._collector._feed(self._data_descriptors_feeder_args)
+            args = (self._data_descriptors_args,)
+        value = self._values[data_descriptor.name] = self._collector._descriptor_data(data_descriptor, *args)
+        return value
+
+    def _dependency(self, name: str) -> Any:
+        if name in self._values:
+            return self._values[name]
+        return self._evaluate(self._collector._descriptors_by_name[name])
+
+
+THREAD_EXECUTOR = "thread"
+PROCESS_EXECUTOR = "process"
+
+
+def _create_executor(executor: str, max_workers: Optional[int]) -> Executor:
+    if executor == THREAD_EXECUTOR:
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if executor == PROCESS_EXECUTOR:
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise ValueError("Unknown executor: " + str(executor) +
+                     ", expected '" + THREAD_EXECUTOR + "' or '" + PROCESS_EXECUTOR + "'")
+
 
 def get_data_sets_based_on_string_list(string_list: List[str],
                                        data_descriptors_feeder: Callable[..., Any],
-                                       data_descriptors: List[DataDescriptor]):
+                                       data_descriptors: List[DataDescriptor],
+                                       executor: Optional[str] = None,
+                                       max_workers: Optional[int] = None,
+                                       chunk_size: int = 1,
+                                       concurrent_descriptors: bool = False,
+                                       cache: Optional[DataSetCache] = None,
+                                       feeder_cache: Optional[LruCache] = None,
+                                       intermediates: Optional[List[DataDescriptor]] = None,
+                                       instrumentation: Optional[Instrumentation] = None,
+                                       projection: Optional[Iterable[str]] = None):
+    """
+        Collects data sets for every location from the string_list, returning them in the same order as the locations.
+
+        By default all data sets are collected one after another in the calling thread. Passing executor allows to
+        spread the work over a pool of workers:
+            - THREAD_EXECUTOR ("thread") - for I/O-bound algorithms (reading files, querying databases),
+            - PROCESS_EXECUTOR ("process") - for CPU-bound algorithms; keep in mind that in this case the feeder and
+              all of the DataDescriptors' algorithms have to be picklable (module-level functions, not lambdas).
+
+        max_workers is passed down to the executor (None means the executor's default), chunk_size is the number of
+        locations sent to a single worker at once - bigger chunks reduce the communication overhead of the process
+        executor. concurrent_descriptors, cache, feeder_cache, intermediates and
+        instrumentation are passed down to the DataSetCollector (with the process executor every worker process
+        gets its own copy of the caches and of the instrumentation). With projection only the named DataDescriptors
+        are collected (see DataSetCollector).
+    """
 
     collector = DataSetCollector(data_descriptors_feeder=data_descriptors_feeder,
-                                 data_descriptors=data_descriptors)
+                                 data_descriptors=data_descriptors,
+                                 concurrent_descriptors=concurrent_descriptors,
+                                 cache=cache,
+                                 feeder_cache=feeder_cache,
+                                 intermediates=intermediates,
+                                 instrumentation=instrumentation)
+    if projection is not None:
+        collector = collector._projection(projection)
+
+    if executor is None:
+        return [collector.data(data_location) for data_location in string_list]
+
+    with _create_executor(executor, max_workers) as pool:
+        return list(pool.map(collector.data, string_list, chunksize=chunk_size))
+
+
+def iterate_data_sets(data_locations: Iterable[Any],
+                      data_descriptors_feeder: Callable[..., Any],
+                      data_descriptors: List[DataDescriptor],
+                      executor: Optional[str] = None,
+                      max_workers: Optional[int] = None,
+                      prefetch: Optional[int] = None,
+                      concurrent_descriptors: bool = False,
+                      cache: Optional[DataSetCache] = None,
+                      feeder_cache: Optional[LruCache] = None,
+                      intermediates: Optional[List[DataDescriptor]] = None,
+                      instrumentation: Optional[Instrumentation] = None,
+                      projection: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+        Generator counterpart of get_data_sets_based_on_string_list - yields the data set for every location from
+        data_locations as soon as it is ready, in the same order as the locations.
+
+        data_locations can be any iterable, also a lazy one (e.g. a generator walking a directory tree) - it is
+        consumed only as far as it is needed.
+
+        Without executor every data set is collected when the consumer asks for it. With executor (see
+        get_data_sets_based_on_string_list) at most prefetch data sets are being collected ahead of the consumer,
+        so the memory usage stays bounded no matter how many locations there are. prefetch defaults to twice the
+        number of workers. concurrent_descriptors, cache, feeder_cache, intermediates and
+        instrumentation are passed down to the DataSetCollector (with the process executor every worker process
+        gets its own copy of the caches and of the instrumentation). With projection only the named DataDescriptors
+        are collected (see DataSetCollector).
+    """
+
+    collector = DataSetCollector(data_descriptors_feeder=data_descriptors_feeder,
+                                 data_descriptors=data_descriptors,
+                                 concurrent_descriptors=concurrent_descriptors,
+                                 cache=cache,
+                                 feeder_cache=feeder_cache,
+                                 intermediates=intermediates,
+                                 instrumentation=instrumentation)
+    if projection is not None:
+        collector = collector._projection(projection)
+
+    if executor is None:
+        for data_location in data_locations:
+            yield collector.data(data_location)
+        return
+
+    if prefetch is None:
+        prefetch = 2 * (max_workers or os.cpu_count() or 1)
+    if prefetch < 1:
+        raise ValueError("prefetch has to be a positive number, got: " + str(prefetch))
+
+    with _create_executor(executor, max_workers) as pool:
+        pending = deque()
+        try:
+            for data_location in data_locations:
+                pending.append(pool.submit(collector.data, data_location))
+                if len(pending) >= prefetch:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # the consumer may stop early - do not waste time on data sets which nobody is waiting for
+            for future in pending:
+                future.cancel()
+
+
+async def get_data_sets_based_on_string_list_async(string_list: List[str],
+                                                   data_descriptors_feeder: Callable[..., Any],
+                                                   data_descriptors: List[DataDescriptor],
+                                                   concurrency_limit: Optional[int] = None,
+                                                   intermediates: Optional[List[DataDescriptor]] = None,
+                                                   instrumentation: Optional[Instrumentation] = None,
+                                                   projection: Optional[Iterable[str]] = None):
+    """
+        Asynchronous counterpart of get_data_sets_based_on_string_list - collects data sets for all locations
+        concurrently (see DataSetCollector.data_async), returning them in the same order as the locations.
+
+        concurrency_limit is the maximal number of data sets being collected at the same time, None means no limit.
+        intermediates and instrumentation are passed down to the DataSetCollector. With projection only the named
+        DataDescriptors are collected (see DataSetCollector).
+    """
+
+    collector = DataSetCollector(data_descriptors_feeder=data_descriptors_feeder,
+                                 data_descriptors=data_descriptors,
+                                 intermediates=intermediates,
+                                 instrumentation=instrumentation)
+    if projection is not None:
+        collector = collector._projection(projection)
+
+    if concurrency_limit is None:
+        return list(await asyncio.gather(*[collector.data_async(data_location) for data_location in string_list]))
+
+    if concurrency_limit < 1:
+        raise ValueError("concurrency_limit has to be a positive number, got: " + str(concurrency_limit))
+
+    # a fixed number of workers taking consecutive locations - no task is created per data set, so the overhead
+    # does not grow with the number of locations
+    data_locations = list(string_list)
+    data_sets = [None] * len(data_locations)
+    next_index = iter(range(len(data_locations)))
+
+    async def worker():
+        for index in next_index:
+            data_sets[index] = await collector.data_async(data_locations[index])
 
-    return [collector.data(data_location) for data_location in string_list]
\ No newline at end of file
+    await asyncio.gather(*[worker() for _ in range(min(concurrency_limit, len(data_locations)))])
+    return data_sets
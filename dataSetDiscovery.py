@@ -0,0 +1,122 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import fnmatch
+import os
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from dataDescriptor import DataDescriptor
+from dataSetCollector import iterate_data_sets
+
+
+def _scan(directory: str) -> List[os.DirEntry]:
+    with os.scandir(directory) as entries:
+        return sorted(entries, key=lambda entry: entry.name)
+
+
+def discover_data_sets(root: str,
+                       pattern: Optional[str] = None,
+                       required_members: Optional[Iterable[str]] = None,
+                       match_files: bool = False,
+                       descend_into_matches: bool = False,
+                       max_depth: Optional[int] = None,
+                       follow_symlinks: bool = False,
+                       on_error: Optional[Callable[[OSError], None]] = None) -> Iterator[str]:
+    """
+        Walks the directory tree under root with os.scandir and lazily yields paths of data sets - every directory is
+        read only once and the paths are yielded as soon as they are found, so the collection of data sets can start
+        before the whole tree is listed (see iterate_discovered_data_sets).
+
+        A data set is:
+            - with match_files - a file with the name matching the pattern (fnmatch-style, e.g. "*.txt"),
+            - otherwise - a directory with the name matching the pattern (if given) and containing all of the
+              required_members (if given), e.g. ["name.txt", "surname.txt", "age.txt"] for the type B layout.
+
+        Entries of every directory are visited in the order of their names, so the result is deterministic.
+        Matching directories are not searched for further data sets, unless descend_into_matches is set. max_depth
+        limits how deep below root the search goes (1 - only the entries of root). Symbolic links to directories are
+        followed only with follow_symlinks. Errors of reading sub-directories are passed to on_error (ignored by
+        default, like in os.walk); errors of reading root are raised.
+    """
+    required_members = set(required_members or [])
+    if match_files and required_members:
+        raise ValueError("required_members can be used only for matching directories")
+    if not match_files and pattern is None and not required_members:
+        raise ValueError("pattern or required_members has to be given")
+
+    # stack of iterators over already scanned directories - depth-first, without recursion
+    stack = [(iter(_scan(root)), 1)]
+    while stack:
+        entries, depth = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            continue
+
+        if not entry.is_dir(follow_symlinks=follow_symlinks):
+            if match_files and (pattern is None or fnmatch.fnmatch(entry.name, pattern)):
+                yield entry.path
+            continue
+
+        descend = max_depth is None or depth < max_depth
+        name_matches = not match_files and (pattern is None or fnmatch.fnmatch(entry.name, pattern))
+        if not descend and not name_matches:
+            continue
+        try:
+            children = _scan(entry.path)
+        except OSError as error:
+            if on_error is not None:
+                on_error(error)
+            continue
+
+        if name_matches and required_members.issubset(child.name for child in children):
+            yield entry.path
+            descend = descend and descend_into_matches
+        if descend:
+            stack.append((iter(children), depth + 1))
+
+
+def iterate_discovered_data_sets(root: str,
+                                 data_descriptors_feeder: Callable[..., Any],
+                                 data_descriptors: List[DataDescriptor],
+                                 pattern: Optional[str] = None,
+                                 required_members: Optional[Iterable[str]] = None,
+                                 match_files: bool = False,
+                                 descend_into_matches: bool = False,
+                                 max_depth: Optional[int] = None,
+                                 follow_symlinks: bool = False,
+                                 on_error: Optional[Callable[[OSError], None]] = None,
+                                 **collection_options) -> Iterator[Any]:
+    """
+        Discovers data sets under root (see discover_data_sets) and streams their paths straight into
+        iterate_data_sets, yielding (path, data set) pairs - listing of the tree and collection of the data sets overlap.
+        collection_options (executor, max_workers, prefetch, caches etc.) are passed down to iterate_data_sets.
+    """
+    locations = deque()
+
+    def discovered():
+        for location in discover_data_sets(root, pattern, required_members, match_files, descend_into_matches,
+                                           max_depth, follow_symlinks, on_error):
+            locations.append(location)
+            yield location
+
+    for data_set in iterate_data_sets(discovered(), data_descriptors_feeder, data_descriptors, **collection_options):
+        yield locations.popleft(), data_set
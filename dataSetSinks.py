@@ -0,0 +1,277 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import csv
+import io
+import json
+import struct
+import sys
+from abc import ABC, abstractmethod
+from array import array, typecodes
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from columnBuffers import numpy
+from dataDescriptor import DataDescriptor
+from dataSetCollector import iterate_data_sets
+
+
+class DataSetSink(ABC):
+    """
+        Base of sinks writing data sets (dictionaries, as returned by DataSetCollector.data) into a file.
+
+        Data sets are encoded when they are written, but kept in a buffer and written to the file in big chunks -
+        whenever the buffer holds flush_rows data sets or flush_bytes bytes (whatever comes first), when flush() is
+        called explicitly and when the sink is closed. The file is not buffered by Python, so every flush is a single
+        write call. Use the sink as a context manager, or call close() when done.
+
+        Subclasses implement _encode(), returning the bytes of a single data set. Formats which are not written data set
+        by data set override write() and _flush_data() as well - then _encode() may return whatever their write()
+        needs.
+    """
+    def __init__(self, file_path: str, flush_rows: int = 10000, flush_bytes: int = 1 << 20):
+        if flush_rows < 1 or flush_bytes < 1:
+            raise ValueError("flush_rows and flush_bytes have to be positive numbers")
+        self.file_path = file_path
+        self.flush_rows = flush_rows
+        self.flush_bytes = flush_bytes
+        self.rows_written = 0
+        self.flushes = 0
+        self._buffer = []
+        self._buffered_rows = 0
+        self._buffered_bytes = 0
+        self._file = open(file_path, 'wb', buffering=0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @abstractmethod
+    def _encode(self, data_set: Dict[str, Any]) -> Any:
+        """ returns the encoded data set """
+
+    def _buffer_row(self, size: int):
+        self._buffered_rows += 1
+        self._buffered_bytes += size
+        self.rows_written += 1
+        if self._buffered_rows >= self.flush_rows or self._buffered_bytes >= self.flush_bytes:
+            self.flush()
+
+    def write(self, data_set: Dict[str, Any]):
+        encoded = self._encode(data_set)
+        self._buffer.append(encoded)
+        self._buffer_row(len(encoded))
+
+    def write_many(self, data_sets: Iterable[Dict[str, Any]]) -> int:
+        """ writes all of the data sets, returning their number """
+        count = 0
+        for data_set in data_sets:
+            self.write(data_set)
+            count += 1
+        return count
+
+    def _flush_data(self) -> bytes:
+        data = b"".join(self._buffer)
+        self._buffer = []
+        return data
+
+    def _write_all(self, data: bytes):
+        view = memoryview(data)
+        while view:
+            written = self._file.write(view)
+            view = view[written:]
+
+    def flush(self):
+        if self._buffered_rows == 0:
+            return
+        self._write_all(self._flush_data())
+        self._buffered_rows = 0
+        self._buffered_bytes = 0
+        self.flushes += 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+
+
+class JsonLinesSink(DataSetSink):
+    """ writes every data set as a JSON object in a separate line """
+    def _encode(self, data_set: Dict[str, Any]) -> bytes:
+        return (json.dumps(data_set, ensure_ascii=False) + "\n").encode()
+
+
+class CsvSink(DataSetSink):
+    """
+        writes data sets as rows of a CSV file with a header - the columns are given by fieldnames, or taken from
+        the keys of the first data set
+    """
+    def __init__(self, file_path: str, fieldnames: Optional[List[str]] = None, flush_rows: int = 10000,
+                 flush_bytes: int = 1 << 20, **csv_format):
+        super().__init__(file_path, flush_rows, flush_bytes)
+        self.fieldnames = fieldnames
+        self._text = io.StringIO()
+        self._writer = csv.writer(self._text, **csv_format)
+        self._header_written = False
+
+    def _encode_row(self, values: Iterable[Any]) -> bytes:
+        self._text.seek(0)
+        self._text.truncate()
+        self._writer.writerow(values)
+        return self._text.getvalue().encode()
+
+    def _encode(self, data_set: Dict[str, Any]) -> bytes:
+        header = b""
+        if not self._header_written:
+            if self.fieldnames is None:
+                self.fieldnames = list(data_set.keys())
+            header = self._encode_row(self.fieldnames)
+            self._header_written = True
+        return header + self._encode_row([data_set.get(name) for name in self.fieldnames])
+
+
+COLUMNAR_MAGIC = b"DSCB\x01"
+_UINT32 = struct.Struct("<I")
+_UINT64 = struct.Struct("<Q")
+
+
+def _array_typecode(dtype: Any) -> Optional[str]:
+    if isinstance(dtype, str) and len(dtype) == 1 and dtype in typecodes:
+        return dtype
+    if numpy is None or dtype is None:
+        return None
+    try:
+        numpy_dtype = numpy.dtype(dtype)
+    except TypeError:
+        return None
+    if numpy_dtype.char in typecodes and numpy_dtype.byteorder in "=|" and \
+            array(numpy_dtype.char).itemsize == numpy_dtype.itemsize:
+        return numpy_dtype.char
+    return None
+
+
+class ColumnarBinarySink(DataSetSink):
+    """
+        Writes data sets into a compact binary columnar file, block by block - every flush writes a block with
+        the buffered data sets stored column by column.
+
+        Columns are given as (name, dtype) pairs, see for_descriptors(). Columns with an array.array typecode are
+        stored as raw arrays of numbers, the other ones as JSON lists. The file can be read with read_columnar_file().
+
+        File layout (little-endian lengths):
+            magic "DSCB\\x01", uint32 length + JSON header {"columns": [[name, dtype], ...], "byteorder": ...},
+            then blocks: uint32 number of data sets, and for every column: uint64 length + column data.
+    """
+    def __init__(self, file_path: str, columns: List[Tuple[str, Optional[str]]], flush_rows: int = 10000,
+                 flush_bytes: int = 1 << 20):
+        super().__init__(file_path, flush_rows, flush_bytes)
+        self.columns = [(name, dtype) for name, dtype in columns]
+        header = json.dumps({"columns": self.columns, "byteorder": sys.byteorder}).encode()
+        self._write_all(COLUMNAR_MAGIC + _UINT32.pack(len(header)) + header)
+        self._new_block()
+
+    @classmethod
+    def for_descriptors(cls, file_path: str, data_descriptors: List[DataDescriptor], **options) -> "ColumnarBinarySink":
+        """
+            sink with a column for every DataDescriptor, typed with its dtype if it is an array.array typecode or
+            a NumPy dtype having one (e.g. 'int64', with NumPy installed) - other columns are stored as JSON
+        """
+        return cls(file_path, [(data_descriptor.name, _array_typecode(data_descriptor.dtype))
+                               for data_descriptor in data_descriptors], **options)
+
+    def _new_block(self):
+        self._block = [array(dtype) if dtype else [] for _, dtype in self.columns]
+
+    def _encode(self, data_set: Dict[str, Any]) -> List[Any]:
+        # all values are checked and encoded first, so a failing data set does not leave the columns misaligned
+        return [array(dtype, [data_set[name]]) if dtype else json.dumps(data_set[name], ensure_ascii=False).encode()
+                for name, dtype in self.columns]
+
+    def write(self, data_set: Dict[str, Any]):
+        values = self._encode(data_set)
+        size = 0
+        for column, value in zip(self._block, values):
+            if isinstance(column, array):
+                column.extend(value)
+                size += column.itemsize
+            else:
+                column.append(value)
+                size += len(value) + 1
+        self._buffer_row(size)
+
+    def _flush_data(self) -> bytes:
+        parts = [_UINT32.pack(self._buffered_rows)]
+        for column, (_, dtype) in zip(self._block, self.columns):
+            data = column.tobytes() if dtype else b"[" + b",".join(column) + b"]"
+            parts.append(_UINT64.pack(len(data)))
+            parts.append(data)
+        self._new_block()
+        return b"".join(parts)
+
+
+def read_columnar_file(file_path: str) -> Dict[str, Any]:
+    """ reads a file written by ColumnarBinarySink, returning {name: column} - array.array or list for every column """
+    with open(file_path, 'rb') as file:
+        content = file.read()
+    if not content.startswith(COLUMNAR_MAGIC):
+        raise ValueError(file_path + " is not a columnar data set file")
+    position = len(COLUMNAR_MAGIC)
+    header_length, = _UINT32.unpack_from(content, position)
+    position += _UINT32.size
+    header = json.loads(content[position:position + header_length])
+    position += header_length
+
+    columns = [array(dtype) if dtype else [] for _, dtype in header["columns"]]
+    while position < len(content):
+        position += _UINT32.size
+        for column, (_, dtype) in zip(columns, header["columns"]):
+            length, = _UINT64.unpack_from(content, position)
+            position += _UINT64.size
+            data = content[position:position + length]
+            position += length
+            if dtype:
+                block = array(dtype)
+                block.frombytes(data)
+                if header["byteorder"] != sys.byteorder:
+                    block.byteswap()
+                column.extend(block)
+            else:
+                column.extend(json.loads(data))
+    return dict(zip([name for name, _ in header["columns"]], columns))
+
+
+def collect_into_sink(data_locations: Iterable[Any],
+                      data_descriptors_feeder: Callable[..., Any],
+                      data_descriptors: List[DataDescriptor],
+                      sink: DataSetSink,
+                      **collection_options) -> int:
+    """
+        Collects data sets for every location (see iterate_data_sets, which gets the collection_options) and writes
+        them into the sink as soon as they are ready - no list of all data sets is built, so the memory usage does not
+        depend on the number of data sets. Returns the number of written data sets; the sink is flushed, but not closed.
+    """
+    count = sink.write_many(iterate_data_sets(data_locations, data_descriptors_feeder, data_descriptors,
+                                              **collection_options))
+    sink.flush()
+    return count
@@ -0,0 +1,173 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import inspect
+import math
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+FEEDER_PHASE = "feeder"
+RETRIEVAL_PHASE = "retrieval"
+TRANSFORMATION_PHASE = "transformation"
+BATCH_FEEDER_PHASE = "batch_feeder"
+BATCH_RETRIEVAL_PHASE = "batch_retrieval"
+BATCH_TRANSFORMATION_PHASE = "batch_transformation"
+
+Hook = Callable[[str, str, float], None]
+
+
+def _nearest_rank(ordered: List[float], percent: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[max(1, math.ceil(percent / 100 * len(ordered))) - 1]
+
+
+class PhaseStatistics:
+    """
+        Statistics of the durations of a single phase of a single algorithm: number of calls, total, minimal and maximal
+        duration and percentiles, estimated from a uniform random sample of at most max_samples durations.
+    """
+    def __init__(self, max_samples: int):
+        self.max_samples = max_samples
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+        self.samples = []
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.minimum = min(self.minimum, seconds)
+        self.maximum = max(self.maximum, seconds)
+        if len(self.samples) < self.max_samples:
+            self.samples.append(seconds)
+        else:
+            # reservoir sampling - every duration has the same chance to stay in the sample
+            index = random.randrange(self.count)
+            if index < self.max_samples:
+                self.samples[index] = seconds
+
+    def percentile(self, percent: float) -> float:
+        """ nearest-rank percentile of the sampled durations, 0.0 if there are no samples """
+        return _nearest_rank(sorted(self.samples), percent)
+
+    def summary(self, percentiles: Tuple[float, ...] = (50, 90, 99)) -> Dict[str, float]:
+        result = {'count': self.count,
+                  'total': self.total,
+                  'mean': self.total / self.count if self.count else 0.0,
+                  'min': self.minimum if self.count else 0.0,
+                  'max': self.maximum}
+        ordered = sorted(self.samples)
+        for percent in percentiles:
+            result['p' + str(percent)] = _nearest_rank(ordered, percent)
+        return result
+
+
+class Instrumentation:
+    """
+        Collects durations of the phases of obtaining data sets:
+            - FEEDER_PHASE - the data descriptors feeder of a DataSetCollector, named after the feeder,
+            - RETRIEVAL_PHASE - the data obtaining algorithm of a DataDescriptor, named after the DataDescriptor,
+            - TRANSFORMATION_PHASE - the data transformation algorithm of a DataDescriptor, named after the DataDescriptor.
+
+        Algorithms collecting a whole batch of data sets at once (see DataSetCollector.data_batch) are measured once
+        per batch, under their own phases - BATCH_FEEDER_PHASE, BATCH_RETRIEVAL_PHASE and BATCH_TRANSFORMATION_PHASE -
+        so the statistics of single data sets are not mixed with the durations of whole batches.
+
+        Workflow with this class should looks as follow:
+
+        [1] Creation: optionally pass hooks - callables getting (phase, name, seconds) of every measured call,
+            e.g. for forwarding the measurements to some metrics system.
+        [2] Pass the object to a DataSetCollector (measures the feeder and all of its DataDescriptors) or to a single
+            DataDescriptor. Asynchronous algorithms are measured until their results are awaited (see measure_async).
+        [3] Read the statistics with statistics() or snapshot().
+
+        Instrumentation costs nothing when it is not passed at all; setting enabled to False switches it off
+        at any time, leaving only a single check per call.
+    """
+    def __init__(self,
+                 hooks: Optional[List[Hook]] = None,
+                 max_samples: int = 10000,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.hooks = list(hooks or [])
+        self.max_samples = max_samples
+        self.clock = clock
+        self.enabled = True
+        self._statistics = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Hook):
+        self.hooks.append(hook)
+
+    def record(self, phase: str, name: str, seconds: float):
+        with self._lock:
+            statistics = self._statistics.get((phase, name))
+            if statistics is None:
+                statistics = self._statistics[(phase, name)] = PhaseStatistics(self.max_samples)
+            statistics.add(seconds)
+        for hook in self.hooks:
+            hook(phase, name, seconds)
+
+    def measure(self, phase: str, name: str, functor: Callable[..., Any], *args: Any) -> Any:
+        """ calls the functor with the args, recording the duration of the call """
+        start = self.clock()
+        result = functor(*args)
+        self.record(phase, name, self.clock() - start)
+        return result
+
+    async def measure_async(self, phase: str, name: str, functor: Callable[..., Any], *args: Any) -> Any:
+        """
+            calls the functor with the args and awaits its result if it is awaitable, recording the duration of both -
+            it includes the time spent by the event loop on other tasks in the meantime
+        """
+        start = self.clock()
+        result = functor(*args)
+        if inspect.isawaitable(result):
+            result = await result
+        self.record(phase, name, self.clock() - start)
+        return result
+
+    def statistics(self, phase: str, name: str) -> Optional[PhaseStatistics]:
+        with self._lock:
+            return self._statistics.get((phase, name))
+
+    def snapshot(self, percentiles: Tuple[float, ...] = (50, 90, 99)) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """ returns summaries of all statistics as {phase: {name: summary}} """
+        result = {}
+        with self._lock:
+            for (phase, name), statistics in self._statistics.items():
+                result.setdefault(phase, {})[name] = statistics.summary(percentiles)
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._statistics.clear()
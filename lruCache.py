@@ -0,0 +1,166 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+class LruCache:
+    """
+        Bounded, thread-safe in-memory cache with least-recently-used eviction and optional time-to-live of entries.
+
+        Used for memoizing results of the data descriptors feeder (see DataSetCollector) and of DataDescriptors
+        (see DataDescriptor) - the cache key is the tuple of arguments the algorithm is called with, so the arguments
+        have to be hashable. Calls with unhashable arguments are simply not cached (and counted as uncacheable).
+
+        Counters (hits, misses, evictions, expirations, uncacheable) can be read with statistics().
+    """
+    def __init__(self,
+                 max_size: int = 1024,
+                 ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_size < 1:
+            raise ValueError("max_size has to be a positive number, got: " + str(max_size))
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.uncacheable = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """ returns the cached value for the key, or calls compute() and caches its result """
+        try:
+            hash(key)
+        except TypeError:
+            with self._lock:
+                self.uncacheable += 1
+            return compute()
+
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+
+        # computed outside of the lock - concurrent misses of the same key may compute the value more than once
+        value = compute()
+
+        with self._lock:
+            self._store(key, value)
+        return value
+
+    def get_or_compute_many(self, keys: Sequence[Hashable],
+                            compute_missing: Callable[[List[Hashable]], Sequence[Any]]) -> List[Any]:
+        """
+            Batch counterpart of get_or_compute - returns the values for all of the keys, in the same order.
+            compute_missing is called once with the keys which are not cached (every key once, in the order of their
+            first occurrence) and has to return their values in the same order; the values are cached.
+        """
+        values = [None] * len(keys)
+        missing_keys = []
+        missing_positions = []
+        missing_cacheable = []
+        first_missing = {}
+        with self._lock:
+            for position, key in enumerate(keys):
+                try:
+                    hash(key)
+                except TypeError:
+                    self.uncacheable += 1
+                    missing_keys.append(key)
+                    missing_positions.append([position])
+                    missing_cacheable.append(False)
+                    continue
+                index = first_missing.get(key)
+                if index is not None:
+                    # a repeated key of the batch - served by the single computation of the first one
+                    self.hits += 1
+                    missing_positions[index].append(position)
+                    continue
+                found, value = self._lookup(key)
+                if found:
+                    values[position] = value
+                else:
+                    first_missing[key] = len(missing_keys)
+                    missing_keys.append(key)
+                    missing_positions.append([position])
+                    missing_cacheable.append(True)
+        if not missing_keys:
+            return values
+
+        computed = compute_missing(missing_keys)
+
+        with self._lock:
+            for index, (key, value) in enumerate(zip(missing_keys, computed)):
+                for position in missing_positions[index]:
+                    values[position] = value
+                if missing_cacheable[index]:
+                    self._store(key, value)
+        return values
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        # has to be called with the lock held
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expiration_time = entry
+            if expiration_time is not None and expiration_time <= self.clock():
+                del self._entries[key]
+                self.expirations += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, value
+        self.misses += 1
+        return False, None
+
+    def _store(self, key: Hashable, value: Any):
+        # has to be called with the lock held
+        self._entries[key] = (value, None if self.ttl is None else self.clock() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def statistics(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'expirations': self.expirations, 'uncacheable': self.uncacheable, 'size': len(self._entries)}
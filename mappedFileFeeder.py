@@ -0,0 +1,100 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import mmap
+import os
+from typing import Dict, Optional, Union
+
+Buffer = Union[mmap.mmap, bytes]
+
+
+def map_file(file_path: str) -> Buffer:
+    """
+        Maps the whole file into memory in read-only mode and returns the mapping - a buffer supporting slicing, find()
+        etc., which reads the file content on demand, without copying it into a str. Empty files cannot be mapped,
+        so for them an empty bytes object is returned.
+
+        The mapping is closed when it is garbage collected, or it can be closed explicitly with close().
+    """
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class MappedFileFeeder:
+    """
+        Data descriptors feeder which maps a file into memory (see map_file) and hands the mapping to DataDescriptors.
+
+        The file path is the location passed to the feeder, joined with file_name if it is given - e.g.
+        MappedFileFeeder("data.txt") maps "<location>/data.txt" for every data set directory.
+    """
+    def __init__(self, file_name: str = ""):
+        self.file_name = file_name
+
+    def __call__(self, location: str) -> Buffer:
+        return map_file(os.path.join(location, self.file_name) if self.file_name else location)
+
+
+def _line_end(buffer: Buffer, start: int) -> int:
+    end = buffer.find(b"\n", start)
+    if end == -1:
+        end = len(buffer)
+    if end > start and buffer[end - 1:end] == b"\r":
+        end -= 1
+    return end
+
+
+def find_prefixed_line(buffer: Buffer, prefix: bytes) -> Optional[bytes]:
+    """
+        Looks for the first line starting with the prefix and returns the rest of the line (without the prefix and
+        the line break), or None if there is no such line. Only the found line is copied out of the buffer.
+    """
+    if buffer[:len(prefix)] == prefix:
+        start = 0
+    else:
+        start = buffer.find(b"\n" + prefix)
+        if start == -1:
+            return None
+        start += 1
+    return buffer[start + len(prefix):_line_end(buffer, start)]
+
+
+def index_prefixed_lines(buffer: Buffer, separator: bytes = b":") -> Dict[bytes, bytes]:
+    """
+        Scans the buffer once and returns a dictionary of all "key<separator>value" lines - keys are the parts before
+        the first separator, values are the parts after it with surrounding whitespace stripped. Lines without the
+        separator are skipped; for repeated keys the first line wins.
+
+        Useful as a shared intermediate (see DataSetCollector) when many DataDescriptors read fields of the same file.
+    """
+    index = {}
+    position = 0
+    length = len(buffer)
+    while position < length:
+        end = _line_end(buffer, position)
+        separator_position = buffer.find(separator, position, end)
+        if separator_position != -1:
+            key = buffer[position:separator_position]
+            if key not in index:
+                index[key] = buffer[separator_position + len(separator):end].strip()
+        next_line = buffer.find(b"\n", end)
+        position = length if next_line == -1 else next_line + 1
+    return index
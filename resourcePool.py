@@ -0,0 +1,107 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+
+class ResourcePool:
+    """
+        Thread-safe pool of reusable resources - e.g. database connections - shared by many batches of data sets.
+
+        Workflow with this class should looks as follow:
+
+        [1] Creation: pass an algorithm creating a new resource, the maximal number of resources and optionally
+            an algorithm closing a resource.
+        [2] Using a resource: "with pool.resource() as connection: ..." - an idle resource is reused, a new one is
+            created if all of them are busy and the limit is not reached yet, otherwise the call waits until some
+            resource is returned to the pool. Resources are created lazily, on the first demand.
+        [3] Closing: close() (or leaving the "with pool:" block) closes all idle resources.
+
+        Typically the pool is used by a batch data descriptors feeder (see DataSetCollector.data_batch), so a single
+        connection serves a whole batch of data sets.
+    """
+    def __init__(self,
+                 factory: Callable[[], Any],
+                 max_size: int = 4,
+                 closer: Optional[Callable[[Any], None]] = None):
+        if max_size < 1:
+            raise ValueError("max_size has to be a positive number, got: " + str(max_size))
+        self.factory = factory
+        self.max_size = max_size
+        self.closer = closer
+        self.created = 0
+        self._idle = []
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def acquire(self) -> Any:
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("ResourcePool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self.created < self.max_size:
+                    self.created += 1
+                    break
+                self._condition.wait()
+        try:
+            return self.factory()
+        except BaseException:
+            with self._condition:
+                self.created -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, resource: Any):
+        with self._condition:
+            if not self._closed:
+                self._idle.append(resource)
+                self._condition.notify()
+                return
+            self.created -= 1
+        if self.closer is not None:
+            self.closer(resource)
+
+    @contextmanager
+    def resource(self) -> Iterator[Any]:
+        resource = self.acquire()
+        try:
+            yield resource
+        finally:
+            self.release(resource)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self.created -= len(idle)
+            self._condition.notify_all()
+        if self.closer is not None:
+            for resource in idle:
+                self.closer(resource)
@@ -0,0 +1,319 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import hashlib
+import os
+import queue
+import threading
+import time
+import traceback
+from multiprocessing import Process
+from multiprocessing.connection import Client, Connection, Listener, answer_challenge, deliver_challenge
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from dataDescriptor import DataDescriptor
+from dataSetCollector import DataSetCollector
+
+Shard = List[Tuple[int, Any]]
+
+_READY = "ready"
+_SHARD = "shard"
+_RESULT = "result"
+_ERROR = "error"
+_STOP = "stop"
+
+# seconds given to local workers for exiting after all of the shards are collected
+_WORKER_STOP_TIMEOUT = 5.0
+
+
+def shard_of(data_location: Any, shard_count: int) -> int:
+    """
+        Returns the number of the shard (0 <= number < shard_count) the location belongs to. The number depends only
+        on repr() of the location - unlike the built-in hash() it is the same in every process and on every node.
+    """
+    if shard_count < 1:
+        raise ValueError("shard_count has to be a positive number, got: " + str(shard_count))
+    digest = hashlib.blake2b(repr(data_location).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+def partition_locations(data_locations: Iterable[Any], shard_count: int) -> List[Shard]:
+    """
+        Splits the locations into shard_count shards (see shard_of). Every shard is a list of (index, location) pairs,
+        where index is the position of the location in data_locations - it is used for merging the results back in
+        the original order (see merge_shard_results).
+    """
+    if shard_count < 1:
+        raise ValueError("shard_count has to be a positive number, got: " + str(shard_count))
+    shards = [[] for _ in range(shard_count)]
+    for index, data_location in enumerate(data_locations):
+        shards[shard_of(data_location, shard_count)].append((index, data_location))
+    return shards
+
+
+def collect_shard(collector: DataSetCollector, shard: Shard) -> List[Tuple[int, Dict[str, Any]]]:
+    """ worker entry point processing a single shard - returns (index, data set) pairs in the order of the shard """
+    return [(index, collector.data(data_location)) for index, data_location in shard]
+
+
+def merge_shard_results(shard_results: Iterable[Sequence[Tuple[int, Any]]],
+                        location_count: Optional[int] = None) -> List[Any]:
+    """
+        Rebuilds the original order of the data sets from the results of all of the shards (in any order). With
+        location_count it is also checked that no location is missing.
+    """
+    indexed = {}
+    for results in shard_results:
+        for index, data_set in results:
+            if index in indexed:
+                raise ValueError("Duplicated result for the location with index " + str(index))
+            indexed[index] = data_set
+    if location_count is None:
+        location_count = len(indexed)
+    missing = [index for index in range(location_count) if index not in indexed]
+    if missing or len(indexed) != location_count:
+        raise ValueError("Missing results for the locations with indexes: " + str(missing))
+    return [indexed[index] for index in range(location_count)]
+
+
+def run_shard_worker(address: Any, authkey: bytes, collector: DataSetCollector) -> int:
+    """
+        Worker entry point: connects to a ShardCoordinator listening on the address, then collects the shards it gets
+        with the collector (see collect_shard) and sends the results back until the coordinator has no more shards.
+        Returns the number of processed shards.
+
+        The worker can run in a local process as well as on another node - the same collector (feeder and
+        DataDescriptors) has to be available there. A shard failing with an exception is reported to the coordinator,
+        which stops the whole collection.
+    """
+    processed = 0
+    with Client(address, authkey=authkey) as connection:
+        connection.send((_READY, os.getpid()))
+        while True:
+            message = connection.recv()
+            if message[0] == _STOP:
+                return processed
+            _, shard_number, shard = message
+            try:
+                results = collect_shard(collector, shard)
+            except Exception:
+                connection.send((_ERROR, shard_number, traceback.format_exc()))
+                return processed
+            connection.send((_RESULT, shard_number, results))
+            processed += 1
+
+
+class ShardCoordinator:
+    """
+        Hands out shards to workers connecting over a multiprocessing.connection transport (a TCP socket, or a Unix
+        socket / named pipe address for workers on the same box) and gathers their results.
+
+        Workflow with this class should looks as follow:
+
+        [1] Creation: pass the shards (see partition_locations), the address to listen on (port 0 picks a free port -
+            the actual address is available as the address attribute) and the authentication key shared with the
+            workers.
+        [2] Starting: start() begins accepting workers (see run_shard_worker) in a background thread. Every worker
+            gets one shard at a time, so faster workers process more of them. A shard of a worker which disconnects
+            before sending its results is handed out again to another worker. Connections which fail the authentication
+            (port probes, wrong authkeys etc.) are dropped without affecting the workers.
+        [3] Waiting: wait() returns True once all of the shards are done (or a shard failed); results() returns
+            the data sets in the original order of the locations (see merge_shard_results), raising RuntimeError if
+            any shard failed.
+        [4] Closing: close() (or leaving the "with coordinator:" block) tells idle workers to stop and closes
+            the listener.
+    """
+    def __init__(self,
+                 shards: List[Shard],
+                 address: Any = ("localhost", 0),
+                 authkey: Optional[bytes] = None):
+        self.shards = shards
+        self.authkey = authkey if authkey is not None else os.urandom(16)
+        # authentication is done by the connection handlers - a peer failing or stalling it blocks only its own
+        # handler, never the accepting thread
+        self._listener = Listener(address)
+        self.address = self._listener.address
+        self._pending = queue.Queue()
+        for shard_number in range(len(shards)):
+            self._pending.put(shard_number)
+        self._results = {}
+        self._errors = []
+        self._done = threading.Event()
+        if not shards:
+            self._done.set()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._accepting = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def start(self):
+        if self._accepting is None:
+            self._accepting = threading.Thread(target=self._accept, daemon=True)
+            self._accepting.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def results(self) -> List[Dict[str, Any]]:
+        self._done.wait()
+        if self._errors:
+            shard_number, error = self._errors[0]
+            raise RuntimeError("Collecting the shard " + str(shard_number) + " failed on a worker:\n" + error)
+        return merge_shard_results((self._results[shard_number] for shard_number in range(len(self.shards))),
+                                   sum(len(shard) for shard in self.shards))
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._done.set()
+        if self._accepting is not None:
+            try:
+                # Listener.accept() cannot be interrupted - wake it up with a connection which is dropped at once;
+                # the listener does no handshake, so connecting does not wait for anything
+                Client(self.address).close()
+            except OSError:
+                pass
+            self._accepting.join()
+        self._listener.close()
+
+    def _accept(self):
+        while True:
+            try:
+                connection = self._listener.accept()
+            except OSError:
+                if self._closed:
+                    return
+                continue
+            if self._closed:
+                connection.close()
+                return
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection: Connection):
+        with connection:
+            try:
+                deliver_challenge(connection, self.authkey)
+                answer_challenge(connection, self.authkey)
+                connection.recv()
+            except Exception:
+                # not a worker (a port probe, a wrong authkey, garbage) or a worker gone before the first shard
+                return
+            while True:
+                shard_number = self._next_shard()
+                if shard_number is None:
+                    try:
+                        connection.send((_STOP,))
+                    except OSError:
+                        pass
+                    return
+                try:
+                    connection.send((_SHARD, shard_number, self.shards[shard_number]))
+                    message = connection.recv()
+                except (EOFError, OSError):
+                    # the worker is gone - give its shard to another one
+                    self._pending.put(shard_number)
+                    return
+                self._finish(shard_number, message)
+                if message[0] == _ERROR:
+                    return
+
+    def _next_shard(self) -> Optional[int]:
+        while not self._done.is_set():
+            try:
+                return self._pending.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        return None
+
+    def _finish(self, shard_number: int, message: tuple):
+        with self._lock:
+            if message[0] == _ERROR:
+                self._errors.append((shard_number, message[2]))
+                self._done.set()
+                return
+            self._results[shard_number] = message[2]
+            if len(self._results) == len(self.shards):
+                self._done.set()
+
+
+def collect_sharded(data_locations: Iterable[Any],
+                    data_descriptors_feeder: Callable[..., Any],
+                    data_descriptors: List[DataDescriptor],
+                    shard_count: Optional[int] = None,
+                    workers: Optional[int] = None,
+                    address: Any = ("localhost", 0),
+                    authkey: Optional[bytes] = None,
+                    **collector_options: Any) -> List[Dict[str, Any]]:
+    """
+        Collects data sets for every location from data_locations in shards, returning them in the same order as
+        the locations.
+
+        The locations are split into shard_count shards (see partition_locations, defaults to four shards per worker)
+        served by a ShardCoordinator listening on the address. workers local worker processes are started (defaults
+        to the number of CPUs) - remote workers can join the same collection by calling run_shard_worker with
+        the coordinator's address and authkey; with workers=0 only remote workers do the work. The feeder and all of
+        the DataDescriptors' algorithms have to be picklable (module-level functions, not lambdas), as well as
+        the collected data. collector_options (concurrent_descriptors, feeder_cache, intermediates, ...) are passed
+        down to the DataSetCollector.
+
+        RuntimeError is raised if collecting any shard failed or if all of the local workers exited before finishing.
+    """
+    data_locations = list(data_locations)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 0:
+        raise ValueError("workers cannot be a negative number, got: " + str(workers))
+    if shard_count is None:
+        shard_count = 4 * max(workers, 1)
+    collector = DataSetCollector(data_descriptors_feeder=data_descriptors_feeder,
+                                 data_descriptors=data_descriptors,
+                                 **collector_options)
+
+    with ShardCoordinator(partition_locations(data_locations, shard_count), address, authkey).start() as coordinator:
+        processes = [Process(target=run_shard_worker, args=(coordinator.address, coordinator.authkey, collector),
+                             daemon=True)
+                     for _ in range(workers)]
+        for process in processes:
+            process.start()
+        try:
+            while not coordinator.wait(0.1):
+                if processes and not any(process.is_alive() for process in processes) and not coordinator.wait(0.1):
+                    raise RuntimeError("All of the shard workers exited before collecting all of the data sets")
+            results = coordinator.results()
+            # the coordinator still accepts late workers and tells them to stop - they exit on their own, the ones
+            # which do not exit in time are terminated below
+            deadline = time.monotonic() + _WORKER_STOP_TIMEOUT
+            for process in processes:
+                process.join(max(deadline - time.monotonic(), 0))
+        finally:
+            coordinator.close()
+            for process in processes:
+                process.join(1)
+                if process.is_alive():
+                    process.terminate()
+    return results
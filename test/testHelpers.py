@@ -0,0 +1,65 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+from typing import Iterable, List
+from dataDescriptor import DataDescriptor
+
+# module-level helpers shared by the tests - picklable, so they can be used with the process executor too
+
+
+def read_file(filepath: str):
+    with open(filepath, 'r') as file:
+        return file.read()
+
+
+def read_name(directory: str):
+    return read_file(directory + "/name.txt")
+
+
+def read_surname(directory: str):
+    return read_file(directory + "/surname.txt")
+
+
+def read_age(directory: str):
+    return read_file(directory + "/age.txt")
+
+
+def age_ratio(age: str):
+    return int(age) / 100
+
+
+def pass_arg_down(arg):
+    return arg
+
+
+def type_b_descriptors(names: Iterable[str] = ("name", "surname", "age"), typed: bool = False) -> List[DataDescriptor]:
+    """
+        DataDescriptors of the type B layout (a directory per data set), optionally with array.array dtypes -
+        name, surname, age and ratio (the age divided by 100)
+    """
+    descriptors = {
+        "name": DataDescriptor(name="name", data_retrieving_functor=read_name),
+        "surname": DataDescriptor(name="surname", data_retrieving_functor=read_surname),
+        "age": DataDescriptor(name="age", data_retrieving_functor=read_age, data_transformation_functor=int,
+                              dtype='q' if typed else None),
+        "ratio": DataDescriptor(name="ratio", data_retrieving_functor=read_age, data_transformation_functor=age_ratio,
+                                dtype='d' if typed else None),
+    }
+    return [descriptors[name] for name in names]
@@ -0,0 +1,76 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import json
+import os
+import tempfile
+from unittest import TestCase
+from benchmark.benchmarkCollection import run_benchmarks, compare_results, collector_arguments, main, TYPE_A, TYPE_B, \
+    SYNTHETIC
+from benchmark.syntheticDataSets import generate_type_a_tree, generate_type_b_tree
+from dataSetCollector import get_data_sets_based_on_string_list
+
+
+class TestSyntheticDataSets(TestCase):
+    def test_layouts_give_the_same_data(self):
+        with tempfile.TemporaryDirectory() as directory:
+            type_a = generate_type_a_tree(os.path.join(directory, "a"), 5, fields=4)
+            type_b = generate_type_b_tree(os.path.join(directory, "b"), 5, fields=4)
+            self.assertEqual(len(type_a), 5)
+            self.assertEqual(sorted(os.listdir(type_b[0])), ["age.txt", "field3.txt", "name.txt", "surname.txt"])
+
+            type_a_data = get_data_sets_based_on_string_list(type_a, *collector_arguments(TYPE_A, 4))
+            type_b_data = get_data_sets_based_on_string_list(type_b, *collector_arguments(TYPE_B, 4))
+            self.assertEqual(type_a_data, type_b_data)
+            self.assertEqual(type_a_data[3], {"name": "name_3", "surname": "surname_3", "age": 3, "field3": "field3_3"})
+
+
+class TestBenchmark(TestCase):
+    def test_run_and_compare(self):
+        with tempfile.TemporaryDirectory() as directory:
+            results = run_benchmarks(directory, [10], [TYPE_A, TYPE_B], ["data", "get_data_sets_based_on_string_list"])
+            self.assertEqual(len(results['results']), 4)
+            data_result = results['results'][0]
+            self.assertEqual((data_result['method'], data_result['layout'], data_result['sets']), ("data", TYPE_A, 10))
+            self.assertGreater(data_result['sets_per_second'], 0)
+            self.assertEqual(sorted(data_result['latency'].keys()), ["p50", "p90", "p99"])
+            self.assertGreater(data_result['peak_memory_bytes'], 0)
+            self.assertIsNone(results['results'][1]['latency'])
+
+            comparison = compare_results(results, results)
+            self.assertEqual(len(comparison), 4)
+            self.assertEqual(comparison[0]['speedup'], 1.0)
+
+    def test_main_writes_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            main(["--sizes", "5", "--layouts", TYPE_B, "--methods", "data_list", "--no-memory",
+                  "--work-directory", directory, "--output", output])
+            with open(output, 'r') as file:
+                results = json.load(file)
+            self.assertEqual(len(results['results']), 1)
+            self.assertIsNone(results['results'][0]['peak_memory_bytes'])
+
+    def test_compiled_methods_on_synthetic_layout(self):
+        results = run_benchmarks("", [20], [SYNTHETIC], ["data", "compiled_data", "compiled_tuple_data_sets"],
+                                 measure_memory=False)
+        self.assertEqual([result['method'] for result in results['results']],
+                         ["data", "compiled_data", "compiled_tuple_data_sets"])
+        self.assertTrue(all(result['sets'] == 20 for result in results['results']))
@@ -0,0 +1,157 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+from array import array
+from unittest import TestCase, skipIf
+from columnBuffers import create_column_buffer, numpy, ListColumnBuffer, ArrayColumnBuffer
+from dataDescriptor import DataDescriptor
+from dataSetCollector import DataSetCollector
+from test.testHelpers import read_age, read_name, type_b_descriptors
+
+
+class TestColumnBuffers(TestCase):
+    def test_create(self):
+        self.assertIsInstance(create_column_buffer(None), ListColumnBuffer)
+        self.assertIsInstance(create_column_buffer('q'), ArrayColumnBuffer)
+
+    def test_array_buffer(self):
+        buffer = create_column_buffer('q')
+        for i in range(10):
+            buffer.append(i)
+        buffer.extend([10, 11])
+        self.assertEqual(len(buffer), 12)
+        self.assertEqual(buffer.result(), array('q', range(12)))
+
+    @skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_buffer(self):
+        buffer = create_column_buffer('int64', use_numpy=True, chunk_size=3)
+        self.assertEqual(len(buffer.result()), 0)
+        for i in range(7):
+            buffer.append(i)
+        buffer.extend(range(7, 12))
+        self.assertEqual(len(buffer), 12)
+        self.assertEqual(buffer.result().dtype, numpy.dtype('int64'))
+        self.assertEqual(buffer.result().tolist(), list(range(12)))
+        buffer.append(12)
+        self.assertEqual(buffer.result().tolist(), list(range(13)))
+
+    @skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_object_buffer(self):
+        buffer = create_column_buffer(None, use_numpy=True, chunk_size=3)
+        buffer.append((0, 1))
+        buffer.extend([(2, 3), (4, 5), (6, 7)])
+        buffer.extend(iter([[8, 9]]))
+        result = buffer.result()
+        self.assertEqual(result.shape, (5,))
+        self.assertEqual(result.tolist(), [(0, 1), (2, 3), (4, 5), (6, 7), [8, 9]])
+
+    @skipIf(numpy is not None, "NumPy is installed")
+    def test_numpy_missing(self):
+        with self.assertRaises(ImportError):
+            create_column_buffer('int64', use_numpy=True)
+
+    @skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            create_column_buffer('int64', use_numpy=True, chunk_size=0)
+
+
+class TestDataColumns(TestCase):
+    string_list = ["test/data/typeB/set1", "test/data/typeB/set2"] * 3
+
+    def test_array_columns(self):
+        collector = DataSetCollector(lambda arg: arg, type_b_descriptors(("name", "age", "ratio"), typed=True))
+        columns = collector.data_columns(self.string_list)
+        self.assertEqual(list(columns.keys()), ["name", "age", "ratio"])
+        self.assertEqual(columns["name"], ["Adam", "Maja"] * 3)
+        self.assertEqual(columns["age"], array('q', [34, 12] * 3))
+        self.assertEqual(columns["ratio"], array('d', [0.34, 0.12] * 3))
+
+    def test_lazy_locations(self):
+        collector = DataSetCollector(lambda arg: arg, type_b_descriptors(("name", "age", "ratio"), typed=True))
+        columns = collector.data_columns(iter(self.string_list))
+        self.assertEqual(len(columns["age"]), 6)
+
+    @skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_columns(self):
+        collector = DataSetCollector(lambda arg: arg, type_b_descriptors(("name", "age", "ratio"), typed=True))
+        columns = collector.data_columns(self.string_list, use_numpy=True, chunk_size=4)
+        self.assertEqual(columns["age"].dtype, numpy.dtype('q'))
+        self.assertEqual(columns["age"].tolist(), [34, 12] * 3)
+        self.assertEqual(columns["name"].tolist(), ["Adam", "Maja"] * 3)
+
+    @skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_columns_of_sequences(self):
+        collector = DataSetCollector(lambda arg: arg, [
+            DataDescriptor(name="name_and_age", data_retrieving_functor=lambda directory: (read_name(directory),
+                                                                                           int(read_age(directory)))),
+        ])
+        columns = collector.data_columns(self.string_list, use_numpy=True, chunk_size=4)
+        self.assertEqual(columns["name_and_age"].tolist(), [("Adam", 34), ("Maja", 12)] * 3)
+
+
+class TestBatchTransformations(TestCase):
+    string_list = ["test/data/typeB/set1", "test/data/typeB/set2"] * 5
+
+    def test_data_columns_use_batch_transformation(self):
+        batches = []
+
+        def add_2000(ages):
+            batches.append(len(ages))
+            return [age + 2000 for age in ages]
+
+        descriptors = [
+            DataDescriptor(name="age", data_retrieving_functor=read_age,
+                           data_transformation_functor=lambda age: int(age) + 2000,
+                           batch_data_transformation_functor=lambda ages: add_2000([int(age) for age in ages]),
+                           dtype='q'),
+        ]
+        collector = DataSetCollector(lambda arg: arg, descriptors)
+        columns = collector.data_columns(self.string_list, chunk_size=4)
+        self.assertEqual(columns["age"], array('q', [2034, 2012] * 5))
+        self.assertEqual(batches, [4, 4, 2])
+        self.assertEqual(list(columns["age"]), [collector.data(location)["age"] for location in self.string_list])
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            DataSetCollector(lambda arg: arg, type_b_descriptors(("name", "age", "ratio"), typed=True)).data_columns(
+                self.string_list, chunk_size=0)
+
+    @skipIf(numpy is None, "NumPy is not installed")
+    def test_vectorized_numpy_transformation(self):
+        descriptors = [
+            DataDescriptor(name="age", data_retrieving_functor=read_age,
+                           data_transformation_functor=lambda age: int(age) + 2000,
+                           batch_data_transformation_functor=lambda ages: numpy.array(ages, dtype='int64') + 2000,
+                           dtype='int64'),
+        ]
+        collector = DataSetCollector(lambda arg: arg, descriptors)
+        columns = collector.data_columns(self.string_list, use_numpy=True, chunk_size=3)
+        self.assertEqual(columns["age"].tolist(), [2034, 2012] * 5)
+        self.assertEqual(columns["age"].tolist(), [collector.data(location)["age"] for location in self.string_list])
+
+        # rows of data_batch are plain Python values, the same as from data():
+        rows = collector.data_batch(self.string_list[:2])
+        self.assertEqual(rows, [collector.data(location) for location in self.string_list[:2]])
+        self.assertIs(type(rows[0]["age"]), int)
+
+        # array columns accept NumPy results as well:
+        descriptors[0].dtype = 'q'
+        self.assertEqual(collector.data_columns(self.string_list, chunk_size=3)["age"], array('q', [2034, 2012] * 5))
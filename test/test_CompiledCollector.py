@@ -0,0 +1,96 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import pickle
+from unittest import TestCase
+from compiledCollector import CompiledDataSetCollector, FrozenDataDescriptor, ROW_TUPLE, ROW_NAMEDTUPLE
+from dataDescriptor import DataDescriptor
+from dataSetCollector import DataSetCollector
+from lruCache import LruCache
+from test.testHelpers import pass_arg_down
+
+
+def count_a(s: str):
+    return s.count("a")
+
+
+def count_b(s: str):
+    return s.count("b")
+
+
+class TestCompiledDataSetCollector(TestCase):
+    @staticmethod
+    def descriptors():
+        return [
+            DataDescriptor("a", count_a),
+            DataDescriptor("b", count_b, str),
+            DataDescriptor("not an identifier", lambda s: len(s)),
+        ]
+
+    def test_same_as_data_set_collector(self):
+        collector = DataSetCollector(pass_arg_down, self.descriptors())
+        compiled = CompiledDataSetCollector(pass_arg_down, self.descriptors())
+        for text in ["abcdefgh", "beef", "abba", ""]:
+            self.assertEqual(compiled.data(text), collector.data(text))
+            self.assertEqual(compiled.data_list(text), collector.data_list(text))
+        self.assertEqual(compiled.data_sets(["abba", "beef"]), [collector.data("abba"), collector.data("beef")])
+        self.assertEqual(list(compiled.iterate_data_sets(iter(["abba"]))), [collector.data("abba")])
+
+    def test_row_types(self):
+        compiled = CompiledDataSetCollector(pass_arg_down, self.descriptors(), row_type=ROW_TUPLE)
+        self.assertEqual(compiled.data("abba"), (2, "2", 4))
+
+        compiled = CompiledDataSetCollector(pass_arg_down, self.descriptors(), row_type=ROW_NAMEDTUPLE)
+        row = compiled.data("abba")
+        self.assertIsInstance(row, compiled.row_class)
+        self.assertEqual((row.a, row.b, row[2]), (2, "2", 4))
+
+        single = CompiledDataSetCollector(pass_arg_down, self.descriptors()[:1], row_type=ROW_TUPLE)
+        self.assertEqual(single.data("abba"), (2,))
+
+        with self.assertRaises(ValueError):
+            CompiledDataSetCollector(pass_arg_down, self.descriptors(), row_type="set")
+
+    def test_frozen_descriptors(self):
+        descriptors = self.descriptors()
+        compiled = CompiledDataSetCollector(pass_arg_down, descriptors)
+        # changing the list after creation does not affect the compiled collector:
+        descriptors.append(DataDescriptor("c", lambda s: s.count("c")))
+        self.assertEqual(list(compiled.data("abc").keys()), ["a", "b", "not an identifier"])
+
+        frozen = compiled.data_descriptors[0]
+        self.assertIsInstance(frozen, FrozenDataDescriptor)
+        self.assertEqual(frozen.data("aa"), 2)
+        with self.assertRaises(AttributeError):
+            frozen.name = "x"
+        with self.assertRaises(AttributeError):
+            frozen.something = 1
+
+    def test_unsupported_descriptors(self):
+        with self.assertRaises(ValueError):
+            CompiledDataSetCollector(pass_arg_down, [DataDescriptor("a", count_a, cache=LruCache())])
+        with self.assertRaises(ValueError):
+            CompiledDataSetCollector(pass_arg_down, [DataDescriptor("a", count_a, dependencies=["b"])])
+
+    def test_picklable(self):
+        compiled = CompiledDataSetCollector(pass_arg_down, [DataDescriptor("a", count_a), DataDescriptor("b", count_b)],
+                                            row_type=ROW_TUPLE)
+        restored = pickle.loads(pickle.dumps(compiled))
+        self.assertEqual(restored.data("abba"), (2, 2))
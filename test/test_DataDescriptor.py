@@ -18,8 +18,10 @@
 #    SOFTWARE.
 #
 
+import asyncio
 from unittest import TestCase
 from dataDescriptor import DataDescriptor
+from lruCache import LruCache
 
 
 class TestDataDescriptor(TestCase):
@@ -54,3 +56,56 @@ class TestDataDescriptor(TestCase):
         self.assertEqual(c.name, "a")
         self.assertEqual(c.data(1), "c")
         self.assertEqual(c.data(3), "ccc")
+
+    def test_async(self):
+        async def get_a_async(count: int):
+            await asyncio.sleep(0)
+            return self.get_a(count)
+
+        async def to_upper_async(s: str):
+            return s.upper()
+
+        a = DataDescriptor("a", get_a_async, to_upper_async)
+        self.assertEqual(asyncio.run(a.data_async(3)), "AAA")
+
+        # synchronous algorithms work with data_async() too:
+        b = DataDescriptor("b", self.get_b, lambda s: s.upper())
+        self.assertEqual(asyncio.run(b.data_async(2, "c")), "BBC")
+
+    def test_batch_transformation(self):
+        calls = []
+
+        def add_2000(ages):
+            calls.append(ages)
+            return [age + 2000 for age in ages]
+
+        c = DataDescriptor("age", lambda age: int(age), lambda age: age + 2000,
+                           batch_data_transformation_functor=add_2000)
+        # single data set - the per-value transformation:
+        self.assertEqual(c.data("34"), 2034)
+        self.assertEqual(calls, [])
+
+        # many data sets - the batch transformation, called once, with the same results:
+        self.assertEqual(c.data_batch([("34",), ("12",)]), [c.data("34"), c.data("12")])
+        self.assertEqual(calls, [[34, 12]])
+
+    def test_batch_retrieval_with_cache(self):
+        calls = []
+
+        def get_many_a(counts):
+            calls.append(counts)
+            return [self.get_a(count) for count in counts]
+
+        cache = LruCache()
+        a = DataDescriptor("a", self.get_a, str.upper, cache=cache, batch_data_retrieving_functor=get_many_a)
+        self.assertEqual(a.data(1), "A")
+        self.assertEqual(a.data_batch([(1,), (2,), (3,)]), ["A", "AA", "AAA"])
+        self.assertEqual(a.data_batch([(3,), (2,)]), ["AAA", "AA"])
+        # only the data sets missing in the cache are obtained, with a single call:
+        self.assertEqual(calls, [[2, 3]])
+        self.assertEqual((cache.hits, cache.misses), (3, 3))
+
+    def test_invalid_batch_transformation(self):
+        c = DataDescriptor("a", self.get_a, batch_data_transformation_functor=lambda values: values[1:])
+        with self.assertRaises(ValueError):
+            c.data_batch([(1,), (2,)])
@@ -0,0 +1,172 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import os
+import pickle
+import shutil
+import tempfile
+from unittest import TestCase
+from dataDescriptor import DataDescriptor
+from dataSetCache import DataSetCache, stat_fingerprint, content_fingerprint
+from dataSetCollector import DataSetCollector, get_data_sets_based_on_string_list
+
+
+class TestDataSetCache(TestCase):
+    """
+        Type B scenario (see test_DataSetCollector) - collected from a copy of the test data, so it can be modified.
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.data_directory = os.path.join(self.directory, "data")
+        shutil.copytree("test/data/typeB", self.data_directory)
+        self.cache_directory = os.path.join(self.directory, "cache")
+        self.reads = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read_file(self, filepath: str):
+        self.reads.append(filepath)
+        with open(filepath, 'r') as file:
+            return file.read()
+
+    def descriptors(self):
+        return [
+            DataDescriptor(name="name", data_retrieving_functor=lambda directory: self.read_file(directory + "/name.txt")),
+            DataDescriptor(name="age", data_retrieving_functor=lambda directory: self.read_file(directory + "/age.txt"),
+                           data_transformation_functor=int),
+        ]
+
+    def location(self, set_name: str):
+        return os.path.join(self.data_directory, set_name)
+
+    def test_unchanged_sets_are_served_from_cache(self):
+        cache = DataSetCache(self.cache_directory)
+        collector = DataSetCollector(lambda arg: arg, self.descriptors(), cache=cache)
+
+        self.assertEqual(collector.data(self.location("set1")), {"name": "Adam", "age": 34})
+        self.assertEqual(collector.data_list(self.location("set2")), ["Maja", 12])
+        self.assertEqual(len(self.reads), 4)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+        self.assertEqual(collector.data(self.location("set1")), {"name": "Adam", "age": 34})
+        self.assertEqual(collector.data(self.location("set2")), {"name": "Maja", "age": 12})
+        self.assertEqual(len(self.reads), 4)
+        self.assertEqual(cache.statistics(), {"hits": 2, "misses": 2, "hit_ratio": 0.5})
+
+        # a new cache object (e.g. next run) uses the same files:
+        cache = DataSetCache(self.cache_directory)
+        collector = DataSetCollector(lambda arg: arg, self.descriptors(), cache=cache)
+        self.assertEqual(collector.data(self.location("set2")), {"name": "Maja", "age": 12})
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_changed_set_is_collected_again(self):
+        cache = DataSetCache(self.cache_directory)
+        collector = DataSetCollector(lambda arg: arg, self.descriptors(), cache=cache)
+        collector.data(self.location("set1"))
+        collector.data(self.location("set2"))
+
+        with open(self.location("set1") + "/age.txt", 'w') as file:
+            file.write("35\n")
+
+        self.assertEqual(collector.data(self.location("set1")), {"name": "Adam", "age": 35})
+        self.assertEqual(collector.data(self.location("set2")), {"name": "Maja", "age": 12})
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+    def test_descriptors_and_version_are_part_of_key(self):
+        cache = DataSetCache(self.cache_directory)
+        DataSetCollector(lambda arg: arg, self.descriptors(), cache=cache).data(self.location("set1"))
+
+        collector = DataSetCollector(lambda arg: arg, self.descriptors()[:1], cache=cache)
+        self.assertEqual(collector.data(self.location("set1")), {"name": "Adam"})
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+        cache = DataSetCache(self.cache_directory, version="2")
+        collector = DataSetCollector(lambda arg: arg, self.descriptors()[:1], cache=cache)
+        collector.data(self.location("set1"))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_invalidate_and_clear(self):
+        cache = DataSetCache(self.cache_directory)
+        collector = DataSetCollector(lambda arg: arg, self.descriptors(), cache=cache)
+        collector.data(self.location("set1"))
+        collector.data(self.location("set2"))
+
+        self.assertTrue(cache.invalidate(self.location("set1")))
+        self.assertFalse(cache.invalidate(self.location("set1")))
+        collector.data(self.location("set1"))
+        collector.data(self.location("set2"))
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+        cache.clear()
+        collector.data(self.location("set1"))
+        collector.data(self.location("set2"))
+        self.assertEqual((cache.hits, cache.misses), (1, 5))
+
+    def test_damaged_entry(self):
+        cache = DataSetCache(self.cache_directory)
+        collector = DataSetCollector(lambda arg: arg, self.descriptors(), cache=cache)
+        collector.data(self.location("set1"))
+        with open(cache._entry_path((self.location("set1"),)), 'wb') as file:
+            file.write(b"garbage")
+        self.assertEqual(collector.data(self.location("set1")), {"name": "Adam", "age": 34})
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_with_get_data_sets(self):
+        cache = DataSetCache(self.cache_directory, fingerprint=content_fingerprint)
+        string_list = [self.location("set1"), self.location("set2")]
+        first = get_data_sets_based_on_string_list(string_list, lambda arg: arg, self.descriptors(), cache=cache)
+        second = get_data_sets_based_on_string_list(string_list, lambda arg: arg, self.descriptors(), cache=cache,
+                                                    executor="thread")
+        self.assertEqual(first, second)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_picklable(self):
+        cache = pickle.loads(pickle.dumps(DataSetCache(self.cache_directory)))
+        self.assertEqual(cache.cache_directory, self.cache_directory)
+        self.assertEqual(cache.statistics()["hits"], 0)
+
+
+class TestFingerprints(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        shutil.copytree("test/data/typeB/set1", os.path.join(self.directory, "set1"))
+        self.location = os.path.join(self.directory, "set1")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_stat_fingerprint(self):
+        fingerprint = stat_fingerprint(self.location)
+        self.assertEqual(stat_fingerprint(self.location), fingerprint)
+        self.assertNotEqual(stat_fingerprint(self.location + "/name.txt"), fingerprint)
+
+        with open(self.location + "/new.txt", 'w') as file:
+            file.write("new")
+        self.assertNotEqual(stat_fingerprint(self.location), fingerprint)
+
+    def test_content_fingerprint(self):
+        fingerprint = content_fingerprint(self.location)
+        os.utime(self.location + "/name.txt", ns=(0, 0))
+        self.assertEqual(content_fingerprint(self.location), fingerprint)
+
+        with open(self.location + "/name.txt", 'w') as file:
+            file.write("Eve")
+        self.assertNotEqual(content_fingerprint(self.location), fingerprint)
@@ -18,9 +18,16 @@
 #    SOFTWARE.
 #
 
-from unittest import TestCase
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from unittest import TestCase, skipUnless
 from dataDescriptor import DataDescriptor
-from dataSetCollector import DataSetCollector, get_data_sets_based_on_string_list
+from dataSetCollector import DataSetCollector, get_data_sets_based_on_string_list, iterate_data_sets, \
+    get_data_sets_based_on_string_list_async, LazyDataSet, shared_descriptors_executor
+from test.testHelpers import read_file, read_name, read_age, pass_arg_down, type_b_descriptors
 
 
 class TestDataSetCollectorScenarioTypeA(TestCase):
@@ -260,3 +267,435 @@ class TestDataSetCollectorSynthetic(TestCase):
         self.assertEqual(data['c'], "0")
         self.assertEqual(data['d'], "0")
 
+
+
+class TestDataSetCollectorParallel(TestCase):
+    string_list = ["test/data/typeB/set1", "test/data/typeB/set2"] * 8
+
+    def test_thread_executor_keeps_order(self):
+        expected = get_data_sets_based_on_string_list(self.string_list, pass_arg_down, type_b_descriptors())
+        data = get_data_sets_based_on_string_list(self.string_list, pass_arg_down, type_b_descriptors(),
+                                                  executor="thread", max_workers=4, chunk_size=3)
+        self.assertEqual(data, expected)
+        self.assertEqual(data[0]['name'], "Adam")
+        self.assertEqual(data[1]['name'], "Maja")
+        self.assertEqual(data[15]['age'], 12)
+
+    def test_process_executor_keeps_order(self):
+        expected = get_data_sets_based_on_string_list(self.string_list, pass_arg_down, type_b_descriptors())
+        data = get_data_sets_based_on_string_list(self.string_list, pass_arg_down, type_b_descriptors(),
+                                                  executor="process", max_workers=2, chunk_size=4)
+        self.assertEqual(data, expected)
+
+    def test_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            get_data_sets_based_on_string_list(self.string_list, pass_arg_down, type_b_descriptors(),
+                                               executor="gpu")
+
+
+class TestDataSetCollectorStreaming(TestCase):
+    string_list = ["test/data/typeB/set1", "test/data/typeB/set2"] * 8
+
+    def test_lazy_iterable(self):
+        consumed = []
+
+        def locations():
+            for location in self.string_list:
+                consumed.append(location)
+                yield location
+
+        data_sets = iterate_data_sets(locations(), pass_arg_down, type_b_descriptors())
+        self.assertEqual(consumed, [])
+        self.assertEqual(next(data_sets)['name'], "Adam")
+        self.assertEqual(len(consumed), 1)
+        self.assertEqual(next(data_sets)['name'], "Maja")
+        self.assertEqual(len(consumed), 2)
+
+    def test_bounded_prefetch(self):
+        consumed = []
+
+        def locations():
+            for location in self.string_list:
+                consumed.append(location)
+                yield location
+
+        data_sets = iterate_data_sets(locations(), pass_arg_down, type_b_descriptors(),
+                                      executor="thread", max_workers=2, prefetch=3)
+        self.assertEqual(next(data_sets)['name'], "Adam")
+        self.assertEqual(len(consumed), 3)
+        data_sets.close()
+
+    def test_same_as_list(self):
+        expected = get_data_sets_based_on_string_list(self.string_list, pass_arg_down, type_b_descriptors())
+        self.assertEqual(list(iterate_data_sets(self.string_list, pass_arg_down, type_b_descriptors())), expected)
+        self.assertEqual(list(iterate_data_sets(iter(self.string_list), pass_arg_down, type_b_descriptors(),
+                                                executor="thread", max_workers=3)), expected)
+        self.assertEqual(list(iterate_data_sets(self.string_list, pass_arg_down, type_b_descriptors(),
+                                                executor="process", max_workers=2, prefetch=5)), expected)
+
+    def test_invalid_prefetch(self):
+        with self.assertRaises(ValueError):
+            next(iterate_data_sets(self.string_list, pass_arg_down, type_b_descriptors(), executor="thread", prefetch=0))
+
+
+class TestDataSetCollectorAsync(TestCase):
+    string_list = ["test/data/typeB/set1", "test/data/typeB/set2"] * 8
+
+    @staticmethod
+    def async_descriptors(trace: list):
+        async def read_async(directory: str, file_name: str):
+            trace.append("start " + file_name)
+            await asyncio.sleep(0)
+            trace.append("end " + file_name)
+            return read_file(directory + "/" + file_name)
+
+        return [
+            DataDescriptor(name="name", data_retrieving_functor=lambda directory: read_async(directory, "name.txt")),
+            DataDescriptor(name="surname", data_retrieving_functor=lambda directory: read_async(directory, "surname.txt")),
+            # synchronous algorithm mixed with asynchronous ones:
+            DataDescriptor(name="age", data_retrieving_functor=read_age, data_transformation_functor=int),
+        ]
+
+    def test_data_async(self):
+        trace = []
+
+        async def feeder_async(arg):
+            return arg
+
+        collector = DataSetCollector(feeder_async, self.async_descriptors(trace))
+        data = asyncio.run(collector.data_async("test/data/typeB/set1"))
+        self.assertEqual(data, {"name": "Adam", "surname": "Nowak", "age": 34})
+        # descriptors of a single data set are awaited concurrently:
+        self.assertEqual(trace, ["start name.txt", "start surname.txt", "end name.txt", "end surname.txt"])
+
+        data = asyncio.run(collector.data_list_async("test/data/typeB/set2"))
+        self.assertEqual(data, ["Maja", "Bee", 12])
+
+    def test_get_data_sets_async(self):
+        expected = get_data_sets_based_on_string_list(self.string_list, pass_arg_down, type_b_descriptors())
+        for concurrency_limit in [None, 1, 3, 100]:
+            data = asyncio.run(get_data_sets_based_on_string_list_async(self.string_list, pass_arg_down,
+                                                                        self.async_descriptors([]),
+                                                                        concurrency_limit=concurrency_limit))
+            self.assertEqual(data, expected)
+
+    def test_concurrency_limit(self):
+        running = []
+        max_running = []
+
+        async def feeder_async(arg):
+            running.append(arg)
+            max_running.append(len(running))
+            await asyncio.sleep(0)
+            running.pop()
+            return arg
+
+        asyncio.run(get_data_sets_based_on_string_list_async(self.string_list, feeder_async, type_b_descriptors(),
+                                                             concurrency_limit=3))
+        self.assertEqual(max(max_running), 3)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(get_data_sets_based_on_string_list_async(self.string_list, feeder_async, type_b_descriptors(),
+                                                                 concurrency_limit=0))
+
+
+class TestDataSetCollectorConcurrentDescriptors(TestCase):
+    def test_same_result(self):
+        sequential = DataSetCollector(pass_arg_down, type_b_descriptors())
+        concurrent = DataSetCollector(pass_arg_down, type_b_descriptors(), concurrent_descriptors=True)
+        for location in ["test/data/typeB/set1", "test/data/typeB/set2"]:
+            self.assertEqual(concurrent.data(location), sequential.data(location))
+            self.assertEqual(concurrent.data_list(location), sequential.data_list(location))
+        self.assertEqual(concurrent.data_list("test/data/typeB/set2"), ["Maja", "Bee", 12])
+
+    def test_descriptors_run_concurrently(self):
+        # every descriptor waits until all of them are started - this finishes only if they run at the same time
+        barrier = threading.Barrier(4, timeout=5)
+
+        def wait_for_others(arg):
+            barrier.wait()
+            return threading.get_ident()
+
+        collector = DataSetCollector(pass_arg_down,
+                                     [DataDescriptor(str(i), wait_for_others) for i in range(4)],
+                                     concurrent_descriptors=True)
+        data = collector.data("")
+        self.assertEqual(list(data.keys()), ["0", "1", "2", "3"])
+        self.assertEqual(len(set(data.values())), 4)
+
+    def test_latency_close_to_slowest_descriptor(self):
+        def sleepy(seconds):
+            return lambda arg: time.sleep(seconds) or seconds
+
+        collector = DataSetCollector(pass_arg_down,
+                                     [DataDescriptor(str(i), sleepy(0.2)) for i in range(5)],
+                                     concurrent_descriptors=True)
+        start = time.perf_counter()
+        data = collector.data_list("")
+        self.assertLess(time.perf_counter() - start, 0.6)
+        self.assertEqual(data, [0.2] * 5)
+
+    def test_with_get_data_sets(self):
+        string_list = ["test/data/typeB/set1", "test/data/typeB/set2"] * 4
+        expected = get_data_sets_based_on_string_list(string_list, pass_arg_down, type_b_descriptors())
+        self.assertEqual(get_data_sets_based_on_string_list(string_list, pass_arg_down, type_b_descriptors(),
+                                                            executor="thread", concurrent_descriptors=True),
+                         expected)
+        self.assertEqual(list(iterate_data_sets(string_list, pass_arg_down, type_b_descriptors(),
+                                                concurrent_descriptors=True)),
+                         expected)
+
+    @skipUnless(hasattr(os, "fork"), "fork is not available")
+    def test_fork_after_using_shared_executor(self):
+        # start every thread of the shared pool, so a forked child would inherit only dead ones
+        workers = shared_descriptors_executor()._max_workers
+        barrier = threading.Barrier(workers, timeout=5)
+        DataSetCollector(pass_arg_down, [DataDescriptor(str(i), lambda arg: barrier.wait()) for i in range(workers)],
+                         concurrent_descriptors=True).data("")
+
+        def collect_in_child():
+            collector = DataSetCollector(pass_arg_down, type_b_descriptors(), concurrent_descriptors=True)
+            if collector.data_list("test/data/typeB/set2") != ["Maja", "Bee", 12]:
+                raise AssertionError("unexpected data")
+
+        child = multiprocessing.get_context("fork").Process(target=collect_in_child)
+        child.start()
+        child.join(10)
+        if child.is_alive():
+            child.terminate()
+            child.join()
+            self.fail("collecting in a forked process hangs")
+        self.assertEqual(child.exitcode, 0)
+
+
+class TestDataSetCollectorDependencies(TestCase):
+    """
+        Type A scenario, where the file content is parsed only once per data set into a dictionary shared by all
+        of the fields.
+    """
+    def setUp(self):
+        self.parses = []
+
+    def parse(self, file_content: str):
+        self.parses.append(file_content)
+        return dict(line.split(": ", 1) for line in file_content.split("\n") if line)
+
+    def intermediates(self):
+        return [DataDescriptor(name="fields", data_retrieving_functor=self.parse)]
+
+    @staticmethod
+    def descriptors():
+        return [
+            DataDescriptor(name="name", data_retrieving_functor=lambda fields: fields["name"],
+                           dependencies=["fields"]),
+            DataDescriptor(name="surname", data_retrieving_functor=lambda fields: fields["surname"],
+                           data_transformation_functor=lambda s: s.upper(), dependencies=["fields"]),
+            DataDescriptor(name="age", data_retrieving_functor=lambda fields: fields["age"],
+                           data_transformation_functor=int, dependencies=["fields"]),
+            # depends on other outputs:
+            DataDescriptor(name="full_name", data_retrieving_functor=lambda name, surname: name + " " + surname,
+                           dependencies=["name", "surname"]),
+            # no dependencies - gets the feeder output as usual:
+            DataDescriptor(name="lines", data_retrieving_functor=lambda file_content: file_content.count("\n")),
+        ]
+
+    def test_shared_parse(self):
+        collector = DataSetCollector(read_file, self.descriptors(), intermediates=self.intermediates())
+        self.assertEqual(collector.data("test/data/typeA/set1/data.txt"),
+                         {"name": "Adam", "surname": "NOWAK", "age": 34, "full_name": "Adam NOWAK", "lines": 3})
+        self.assertEqual(collector.data_list("test/data/typeA/set2/data.txt"), ["Maja", "BEE", 12, "Maja BEE", 3])
+        self.assertEqual(len(self.parses), 2)
+
+    def test_concurrent_and_async(self):
+        expected = DataSetCollector(read_file, self.descriptors(), intermediates=self.intermediates()) \
+            .data("test/data/typeA/set1/data.txt")
+
+        collector = DataSetCollector(read_file, self.descriptors(), intermediates=self.intermediates(),
+                                     concurrent_descriptors=True)
+        self.assertEqual(collector.data("test/data/typeA/set1/data.txt"), expected)
+        self.assertEqual(asyncio.run(collector.data_async("test/data/typeA/set1/data.txt")), expected)
+        self.assertEqual(len(self.parses), 3)
+
+    def test_with_get_data_sets(self):
+        data = get_data_sets_based_on_string_list(["test/data/typeA/set1/data.txt", "test/data/typeA/set2/data.txt"],
+                                                  read_file, self.descriptors(), intermediates=self.intermediates())
+        self.assertEqual([d["full_name"] for d in data], ["Adam NOWAK", "Maja BEE"])
+
+    def test_invalid_graphs(self):
+        with self.assertRaisesRegex(ValueError, "unknown"):
+            DataSetCollector(read_file, [DataDescriptor("a", len, dependencies=["b"])])
+        with self.assertRaisesRegex(ValueError, "Cyclic"):
+            DataSetCollector(read_file, [DataDescriptor("a", len, dependencies=["b"]),
+                                         DataDescriptor("b", len, dependencies=["a"])])
+        with self.assertRaisesRegex(ValueError, "Duplicated"):
+            DataSetCollector(read_file, [DataDescriptor("a", len)], intermediates=[DataDescriptor("a", len)])
+
+
+class TestDataSetCollectorBatches(TestCase):
+    string_list = ["test/data/typeB/set1", "test/data/typeB/set2"] * 3
+
+    def test_fallback_without_batch_algorithms(self):
+        collector = DataSetCollector(pass_arg_down, type_b_descriptors())
+        expected = [collector.data(location) for location in self.string_list]
+        self.assertEqual(collector.data_batch(self.string_list), expected)
+        self.assertEqual(collector.data_list_batch(self.string_list), [list(data.values()) for data in expected])
+        self.assertEqual(list(collector.iterate_data_in_batches(iter(self.string_list), batch_size=4)), expected)
+        self.assertEqual(collector.data_batch([]), [])
+
+    def test_batch_algorithms(self):
+        feeder_batches = []
+        retrieving_batches = []
+
+        def feed_batch(locations):
+            feeder_batches.append(locations)
+            return locations
+
+        def read_names(directories):
+            retrieving_batches.append(directories)
+            return [read_name(directory) for directory in directories]
+
+        descriptors = [
+            DataDescriptor(name="name", data_retrieving_functor=read_name, batch_data_retrieving_functor=read_names),
+            DataDescriptor(name="age", data_retrieving_functor=read_age, data_transformation_functor=int),
+        ]
+        for concurrent_descriptors in [False, True]:
+            collector = DataSetCollector(pass_arg_down, descriptors, batch_data_descriptors_feeder=feed_batch,
+                                         concurrent_descriptors=concurrent_descriptors)
+            data = list(collector.iterate_data_in_batches(self.string_list, batch_size=4))
+            self.assertEqual(data, [collector.data(location) for location in self.string_list])
+        self.assertEqual([len(batch) for batch in feeder_batches], [4, 2, 4, 2])
+        self.assertEqual([len(batch) for batch in retrieving_batches], [4, 2, 4, 2])
+
+    def test_batch_with_dependencies(self):
+        descriptors = [
+            DataDescriptor(name="name", data_retrieving_functor=lambda fields: fields["name"],
+                           batch_data_retrieving_functor=lambda batch: [fields["name"] for fields in batch],
+                           dependencies=["fields"]),
+            DataDescriptor(name="greeting", data_retrieving_functor=lambda name, age: name + " (" + age + ")",
+                           batch_data_retrieving_functor=lambda batch: [name + " (" + age + ")" for name, age in batch],
+                           dependencies=["name", "age"]),
+            DataDescriptor(name="age", data_retrieving_functor=lambda fields: fields["age"], dependencies=["fields"]),
+        ]
+        intermediates = [DataDescriptor(name="fields",
+                                        data_retrieving_functor=lambda content: dict(
+                                            line.split(": ") for line in content.split("\n") if line))]
+        collector = DataSetCollector(read_file, descriptors, intermediates=intermediates)
+        locations = ["test/data/typeA/set1/data.txt", "test/data/typeA/set2/data.txt"]
+        self.assertEqual(collector.data_batch(locations), [collector.data(location) for location in locations])
+        self.assertEqual(collector.data_batch(locations)[1]["greeting"], "Maja (12)")
+
+    def test_invalid_batch_results(self):
+        collector = DataSetCollector(pass_arg_down, type_b_descriptors(), batch_data_descriptors_feeder=lambda l: l[1:])
+        with self.assertRaises(ValueError):
+            collector.data_batch(self.string_list)
+
+        collector = DataSetCollector(pass_arg_down, [DataDescriptor("a", len, batch_data_retrieving_functor=lambda b: [])])
+        with self.assertRaises(ValueError):
+            collector.data_batch(self.string_list)
+        with self.assertRaises(ValueError):
+            next(collector.iterate_data_in_batches(self.string_list, batch_size=0))
+
+
+class TestDataSetCollectorProjection(TestCase):
+    def setUp(self):
+        self.reads = []
+
+    def read(self, directory: str, file_name: str):
+        self.reads.append(file_name)
+        return read_file(directory + "/" + file_name)
+
+    def descriptors(self):
+        return [
+            DataDescriptor(name="name", data_retrieving_functor=lambda directory: self.read(directory, "name.txt")),
+            DataDescriptor(name="surname", data_retrieving_functor=lambda directory: self.read(directory, "surname.txt")),
+            DataDescriptor(name="age", data_retrieving_functor=lambda directory: self.read(directory, "age.txt"),
+                           data_transformation_functor=int),
+            DataDescriptor(name="full_name", data_retrieving_functor=lambda name, surname: name + " " + surname,
+                           dependencies=["name", "surname"]),
+        ]
+
+    def test_projection(self):
+        collector = DataSetCollector(pass_arg_down, self.descriptors())
+        self.assertEqual(collector.data("test/data/typeB/set1", projection=["age"]), {"age": 34})
+        self.assertEqual(self.reads, ["age.txt"])
+
+        self.assertEqual(collector.data_list("test/data/typeB/set1", projection=["full_name", "age"]),
+                         ["Adam Nowak", 34])
+        self.assertEqual(sorted(self.reads[1:]), ["age.txt", "name.txt", "surname.txt"])
+
+        self.assertEqual(collector.data_batch(["test/data/typeB/set1", "test/data/typeB/set2"], projection=["name"]),
+                         [{"name": "Adam"}, {"name": "Maja"}])
+        self.assertEqual(collector.data_columns(["test/data/typeB/set2"], projection=["full_name"]),
+                         {"full_name": ["Maja Bee"]})
+
+        with self.assertRaises(ValueError):
+            collector.data("test/data/typeB/set1", projection=["nickname"])
+
+    def test_projection_with_get_data_sets(self):
+        string_list = ["test/data/typeB/set1", "test/data/typeB/set2"]
+        data = get_data_sets_based_on_string_list(string_list, pass_arg_down, self.descriptors(), projection=["surname"])
+        self.assertEqual(data, [{"surname": "Nowak"}, {"surname": "Bee"}])
+        data = list(iterate_data_sets(string_list, pass_arg_down, self.descriptors(), projection=["age"]))
+        self.assertEqual(data, [{"age": 34}, {"age": 12}])
+        self.assertEqual(sorted(set(self.reads)), ["age.txt", "surname.txt"])
+
+    def test_projection_async(self):
+        collector = DataSetCollector(pass_arg_down, self.descriptors())
+        self.assertEqual(asyncio.run(collector.data_async("test/data/typeB/set1", projection=["full_name"])),
+                         {"full_name": "Adam Nowak"})
+        self.assertEqual(asyncio.run(collector.data_list_async("test/data/typeB/set2", projection=["age"])), [12])
+        data = asyncio.run(get_data_sets_based_on_string_list_async(["test/data/typeB/set1", "test/data/typeB/set2"],
+                                                                    pass_arg_down, self.descriptors(),
+                                                                    concurrency_limit=1, projection=["surname"]))
+        self.assertEqual(data, [{"surname": "Nowak"}, {"surname": "Bee"}])
+        self.assertEqual(sorted(set(self.reads)), ["age.txt", "name.txt", "surname.txt"])
+        self.assertEqual(self.reads.count("age.txt"), 1)
+
+    def test_lazy(self):
+        feeds = []
+
+        def feeder(directory):
+            feeds.append(directory)
+            return directory
+
+        collector = DataSetCollector(feeder, self.descriptors())
+        data = collector.data_lazy("test/data/typeB/set1")
+        self.assertIsInstance(data, LazyDataSet)
+        self.assertEqual(list(data.keys()), ["name", "surname", "age", "full_name"])
+        self.assertEqual(len(data), 4)
+        self.assertIn("age", data)
+        self.assertEqual((feeds, self.reads), ([], []))
+
+        self.assertEqual(data["full_name"], "Adam Nowak")
+        self.assertEqual(data["name"], "Adam")
+        self.assertEqual(feeds, ["test/data/typeB/set1"])
+        self.assertEqual(self.reads, ["name.txt", "surname.txt"])
+        self.assertEqual(sorted(data.evaluated()), ["full_name", "name", "surname"])
+        self.assertEqual(repr(data), "LazyDataSet(name='Adam', surname='Nowak', age=..., full_name='Adam Nowak')")
+
+        self.assertEqual(dict(data), collector.data("test/data/typeB/set1"))
+        with self.assertRaises(KeyError):
+            data["nickname"]
+
+    def test_lazy_with_projection_and_intermediates(self):
+        parses = []
+
+        def parse(content):
+            parses.append(content)
+            return dict(line.split(": ") for line in content.split("\n") if line)
+
+        collector = DataSetCollector(read_file, [
+            DataDescriptor(name="name", data_retrieving_functor=lambda fields: fields["name"], dependencies=["fields"]),
+            DataDescriptor(name="age", data_retrieving_functor=lambda fields: fields["age"], dependencies=["fields"],
+                           data_transformation_functor=int),
+            DataDescriptor(name="lines", data_retrieving_functor=lambda content: content.count("\n")),
+        ], intermediates=[DataDescriptor(name="fields", data_retrieving_functor=parse)])
+
+        data = collector.data_lazy("test/data/typeA/set2/data.txt", projection=["age", "name"])
+        self.assertEqual(list(data), ["age", "name"])
+        self.assertEqual((data["age"], data["name"]), (12, "Maja"))
+        self.assertEqual(len(parses), 1)
+        with self.assertRaises(KeyError):
+            data["fields"]
+        with self.assertRaises(KeyError):
+            data["lines"]
@@ -0,0 +1,103 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from dataDescriptor import DataDescriptor
+from dataSetDiscovery import discover_data_sets, iterate_discovered_data_sets
+from test.testHelpers import read_file
+
+
+class TestDiscoverDataSets(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        shutil.copytree("test/data", os.path.join(self.root, "data"))
+        # an incomplete type B data set and a nested one:
+        os.makedirs(os.path.join(self.root, "data/typeB/broken"))
+        with open(os.path.join(self.root, "data/typeB/broken/name.txt"), 'w') as file:
+            file.write("Nobody")
+        shutil.copytree("test/data/typeB/set1", os.path.join(self.root, "data/typeB/set2/set3"))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def relative(self, paths):
+        return [os.path.relpath(path, self.root) for path in paths]
+
+    def test_required_members(self):
+        found = discover_data_sets(self.root, required_members=["name.txt", "surname.txt", "age.txt"])
+        self.assertEqual(self.relative(found), ["data/typeB/set1", "data/typeB/set2"])
+
+        found = discover_data_sets(self.root, required_members=["name.txt", "surname.txt", "age.txt"],
+                                   descend_into_matches=True)
+        self.assertEqual(self.relative(found), ["data/typeB/set1", "data/typeB/set2", "data/typeB/set2/set3"])
+
+    def test_pattern(self):
+        found = discover_data_sets(os.path.join(self.root, "data"), pattern="set*")
+        self.assertEqual(self.relative(found), ["data/typeA/set1", "data/typeA/set2", "data/typeB/set1", "data/typeB/set2"])
+
+        found = discover_data_sets(self.root, pattern="set*", required_members=["data.txt"])
+        self.assertEqual(self.relative(found), ["data/typeA/set1", "data/typeA/set2"])
+
+    def test_match_files(self):
+        found = discover_data_sets(self.root, pattern="data.txt", match_files=True)
+        self.assertEqual(self.relative(found), ["data/typeA/set1/data.txt", "data/typeA/set2/data.txt"])
+
+        found = discover_data_sets(self.root, pattern="*.txt", match_files=True, max_depth=3)
+        self.assertEqual(self.relative(found), [])
+
+    def test_max_depth(self):
+        found = discover_data_sets(self.root, pattern="type*", max_depth=1)
+        self.assertEqual(list(found), [])
+        found = discover_data_sets(self.root, pattern="type*", max_depth=2)
+        self.assertEqual(self.relative(found), ["data/typeA", "data/typeB"])
+
+    def test_lazy(self):
+        found = discover_data_sets(self.root, pattern="set*")
+        self.assertEqual(self.relative([next(found)]), ["data/typeA/set1"])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            list(discover_data_sets(self.root))
+        with self.assertRaises(ValueError):
+            list(discover_data_sets(self.root, match_files=True, required_members=["a"]))
+        with self.assertRaises(FileNotFoundError):
+            list(discover_data_sets(os.path.join(self.root, "missing"), pattern="*"))
+
+    def test_iterate_discovered_data_sets(self):
+        descriptors = [
+            DataDescriptor(name="name", data_retrieving_functor=lambda directory: read_file(directory + "/name.txt")),
+            DataDescriptor(name="age", data_retrieving_functor=lambda directory: read_file(directory + "/age.txt"),
+                           data_transformation_functor=int),
+        ]
+        for options in [{}, {"executor": "thread", "max_workers": 2, "prefetch": 2}]:
+            data = list(iterate_discovered_data_sets(os.path.join(self.root, "data"), lambda arg: arg, descriptors,
+                                                     required_members=["name.txt", "age.txt"], **options))
+            self.assertEqual([(os.path.basename(location), data_set) for location, data_set in data],
+                             [("set1", {"name": "Adam", "age": 34}), ("set2", {"name": "Maja", "age": 12})])
+
+        data = iterate_discovered_data_sets(self.root, lambda arg: arg, descriptors,
+                                            required_members=["name.txt", "age.txt"],
+                                            descend_into_matches=True, max_depth=4, follow_symlinks=False,
+                                            on_error=self.fail, executor="thread")
+        self.assertEqual([(self.relative([location])[0], data_set["age"]) for location, data_set in data],
+                         [("data/typeB/set1", 34), ("data/typeB/set2", 12), ("data/typeB/set2/set3", 34)])
@@ -0,0 +1,130 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import csv
+import json
+import os
+import tempfile
+from array import array
+from unittest import TestCase
+from dataDescriptor import DataDescriptor
+from dataSetCollector import get_data_sets_based_on_string_list
+from dataSetSinks import DataSetSink, JsonLinesSink, CsvSink, ColumnarBinarySink, read_columnar_file, collect_into_sink
+from test.testHelpers import read_age, type_b_descriptors
+
+
+class TestDataSetSinks(TestCase):
+    string_list = ["test/data/typeB/set1", "test/data/typeB/set2"] * 5
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "output")
+        self.expected = get_data_sets_based_on_string_list(self.string_list, lambda arg: arg,
+                                                           type_b_descriptors(("name", "age"), typed=True))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_json_lines(self):
+        with JsonLinesSink(self.path, flush_rows=4) as sink:
+            count = collect_into_sink(self.string_list, lambda arg: arg, type_b_descriptors(("name", "age"), typed=True),
+                                      sink)
+            self.assertEqual(count, 10)
+        self.assertEqual(sink.flushes, 3)
+        with open(self.path, 'r') as file:
+            self.assertEqual([json.loads(line) for line in file], self.expected)
+
+    def test_buffering(self):
+        sink = JsonLinesSink(self.path, flush_rows=100, flush_bytes=60)
+        sink.write({"name": "Adam", "age": 34})
+        self.assertEqual(os.path.getsize(self.path), 0)
+        sink.write({"name": "Maja", "age": 12})
+        sink.write({"name": "Eve", "age": 1})
+        # the buffer exceeded flush_bytes:
+        self.assertEqual(sink.flushes, 1)
+        self.assertGreater(os.path.getsize(self.path), 0)
+        sink.close()
+        sink.close()
+        self.assertEqual(sink.rows_written, 3)
+        with self.assertRaises(ValueError):
+            JsonLinesSink(self.path, flush_rows=0)
+
+    def test_incomplete_sink(self):
+        class NoEncodingSink(DataSetSink):
+            pass
+
+        with self.assertRaises(TypeError):
+            NoEncodingSink(self.path)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_csv(self):
+        with CsvSink(self.path, flush_rows=3) as sink:
+            sink.write_many(self.expected)
+        with open(self.path, 'r', newline='') as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows[0], ["name", "age"])
+        self.assertEqual(rows[1:3], [["Adam", "34"], ["Maja", "12"]])
+        self.assertEqual(len(rows), 11)
+
+        with CsvSink(self.path, fieldnames=["age"], delimiter=";") as sink:
+            sink.write({"name": "Adam", "age": 34})
+        with open(self.path, 'r') as file:
+            self.assertEqual(file.read().splitlines(), ["age", "34"])
+
+    def test_columnar(self):
+        descriptors = type_b_descriptors(("name", "age"), typed=True)
+        with ColumnarBinarySink.for_descriptors(self.path, descriptors, flush_rows=4) as sink:
+            collect_into_sink(self.string_list, lambda arg: arg, descriptors, sink,
+                              executor="thread", max_workers=2)
+        columns = read_columnar_file(self.path)
+        self.assertEqual(columns["name"], [data_set["name"] for data_set in self.expected])
+        self.assertEqual(columns["age"], array('q', [data_set["age"] for data_set in self.expected]))
+
+    def test_columnar_numpy_dtypes(self):
+        descriptors = type_b_descriptors(("name", "age")) + [
+            DataDescriptor(name="year", data_retrieving_functor=read_age,
+                           data_transformation_functor=lambda age: 2020 - int(age), dtype='int64'),
+            DataDescriptor(name="flags", data_retrieving_functor=read_age,
+                           data_transformation_functor=lambda age: [int(age) > 18], dtype=object),
+        ]
+        with ColumnarBinarySink.for_descriptors(self.path, descriptors) as sink:
+            collect_into_sink(self.string_list[:2], lambda arg: arg, descriptors, sink)
+        self.assertEqual(sink.columns[3], ("flags", None))
+        # 'int64' is stored as an array with NumPy installed, as JSON otherwise - the values are the same:
+        columns = read_columnar_file(self.path)
+        self.assertEqual(list(columns["year"]), [1986, 2008])
+        self.assertEqual(columns["flags"], [[True], [False]])
+
+    def test_columnar_invalid_data_set(self):
+        with ColumnarBinarySink(self.path, [("name", None), ("age", 'q')]) as sink:
+            sink.write({"name": "Adam", "age": 34})
+            with self.assertRaises(KeyError):
+                sink.write({"name": "Maja"})
+            with self.assertRaises(TypeError):
+                sink.write({"name": "Maja", "age": "12"})
+        self.assertEqual(read_columnar_file(self.path), {"name": ["Adam"], "age": array('q', [34])})
+
+    def test_columnar_empty_and_invalid_file(self):
+        ColumnarBinarySink(self.path, [("age", 'q')]).close()
+        self.assertEqual(read_columnar_file(self.path), {"age": array('q')})
+        with open(self.path, 'wb') as file:
+            file.write(b"something else")
+        with self.assertRaises(ValueError):
+            read_columnar_file(self.path)
@@ -0,0 +1,161 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import asyncio
+from unittest import TestCase
+from dataDescriptor import DataDescriptor
+from dataSetCollector import DataSetCollector, get_data_sets_based_on_string_list, \
+    get_data_sets_based_on_string_list_async
+from instrumentation import Instrumentation, PhaseStatistics, FEEDER_PHASE, RETRIEVAL_PHASE, TRANSFORMATION_PHASE, \
+    BATCH_FEEDER_PHASE, BATCH_RETRIEVAL_PHASE, BATCH_TRANSFORMATION_PHASE
+from lruCache import LruCache
+from test.testHelpers import read_file, read_name, pass_arg_down, type_b_descriptors
+
+
+class FakeClock:
+    """ every call advances the time by one second """
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+class TestPhaseStatistics(TestCase):
+    def test_summary(self):
+        statistics = PhaseStatistics(max_samples=1000)
+        for i in range(1, 101):
+            statistics.add(float(i))
+        self.assertEqual(statistics.count, 100)
+        self.assertEqual(statistics.percentile(50), 50.0)
+        self.assertEqual(statistics.percentile(99), 99.0)
+        self.assertEqual(statistics.summary(), {'count': 100, 'total': 5050.0, 'mean': 50.5, 'min': 1.0, 'max': 100.0,
+                                                'p50': 50.0, 'p90': 90.0, 'p99': 99.0})
+
+    def test_bounded_samples(self):
+        statistics = PhaseStatistics(max_samples=10)
+        for i in range(1000):
+            statistics.add(float(i))
+        self.assertEqual(len(statistics.samples), 10)
+        self.assertEqual(statistics.count, 1000)
+        self.assertEqual(statistics.maximum, 999.0)
+
+    def test_empty(self):
+        self.assertEqual(PhaseStatistics(max_samples=10).summary()['p50'], 0.0)
+
+
+class TestInstrumentation(TestCase):
+    string_list = ["test/data/typeB/set1", "test/data/typeB/set2"]
+
+    def test_collector(self):
+        instrumentation = Instrumentation(clock=FakeClock())
+        collector = DataSetCollector(pass_arg_down, type_b_descriptors(("name", "age")),
+                                     instrumentation=instrumentation)
+        self.assertEqual(collector.data(self.string_list[0]), {"name": "Adam", "age": 34})
+        self.assertEqual(collector.data_list(self.string_list[1]), ["Maja", 12])
+
+        snapshot = instrumentation.snapshot()
+        self.assertEqual(sorted(snapshot.keys()), [FEEDER_PHASE, RETRIEVAL_PHASE, TRANSFORMATION_PHASE])
+        self.assertEqual(list(snapshot[FEEDER_PHASE].keys()), ["pass_arg_down"])
+        self.assertEqual(snapshot[FEEDER_PHASE]["pass_arg_down"]["count"], 2)
+        self.assertEqual(snapshot[RETRIEVAL_PHASE]["name"]["count"], 2)
+        self.assertEqual(snapshot[TRANSFORMATION_PHASE]["age"]["total"], 2.0)
+
+    def test_hooks(self):
+        measurements = []
+        instrumentation = Instrumentation(hooks=[lambda *measurement: measurements.append(measurement)],
+                                          clock=FakeClock())
+        get_data_sets_based_on_string_list(self.string_list, pass_arg_down, type_b_descriptors(("name", "age")),
+                                           instrumentation=instrumentation)
+        self.assertEqual(len(measurements), 2 * (1 + 2 * 2))
+        self.assertEqual(measurements[:3], [(FEEDER_PHASE, "pass_arg_down", 1.0),
+                                            (RETRIEVAL_PHASE, "name", 1.0),
+                                            (TRANSFORMATION_PHASE, "name", 1.0)])
+
+    def test_concurrent_and_graph(self):
+        instrumentation = Instrumentation()
+        descriptors = [DataDescriptor("length", len, dependencies=["content"]),
+                       DataDescriptor("lines", lambda content: content.count("\n"), dependencies=["content"])]
+        collector = DataSetCollector(pass_arg_down, descriptors, concurrent_descriptors=True,
+                                     intermediates=[DataDescriptor("content", read_file)],
+                                     instrumentation=instrumentation)
+        collector.data("test/data/typeA/set1/data.txt")
+        self.assertEqual(sorted(instrumentation.snapshot()[RETRIEVAL_PHASE].keys()), ["content", "length", "lines"])
+
+    def test_async(self):
+        async def read_age(directory):
+            await asyncio.sleep(0)
+            return read_file(directory + "/age.txt")
+
+        instrumentation = Instrumentation(clock=FakeClock())
+        descriptors = [DataDescriptor("age", read_age, data_transformation_functor=int),
+                       DataDescriptor("decade", lambda age: age // 10, dependencies=["age"])]
+        data = asyncio.run(get_data_sets_based_on_string_list_async(self.string_list, pass_arg_down, descriptors,
+                                                                    concurrency_limit=1,
+                                                                    instrumentation=instrumentation))
+        self.assertEqual(data, [{"age": 34, "decade": 3}, {"age": 12, "decade": 1}])
+
+        snapshot = instrumentation.snapshot()
+        self.assertEqual(snapshot[FEEDER_PHASE]["pass_arg_down"]["count"], 2)
+        self.assertEqual(sorted(snapshot[RETRIEVAL_PHASE].keys()), ["age", "decade"])
+        self.assertEqual(snapshot[TRANSFORMATION_PHASE]["age"]["count"], 2)
+
+        descriptor = DataDescriptor("a", read_age, instrumentation=Instrumentation())
+        self.assertEqual(asyncio.run(descriptor.data_async(self.string_list[0])), "34")
+        self.assertEqual(descriptor.instrumentation.statistics(RETRIEVAL_PHASE, "a").count, 1)
+
+    def test_batches(self):
+        instrumentation = Instrumentation(clock=FakeClock())
+        descriptors = [DataDescriptor("name", read_name, batch_data_retrieving_functor=lambda directories: [
+            read_name(directory) for directory in directories])]
+        collector = DataSetCollector(pass_arg_down, descriptors, instrumentation=instrumentation,
+                                     batch_data_descriptors_feeder=list)
+        collector.data(self.string_list[0])
+        collector.data_batch(self.string_list * 3)
+
+        # a whole batch is measured once, separately from single data sets:
+        snapshot = instrumentation.snapshot()
+        self.assertEqual(snapshot[FEEDER_PHASE]["pass_arg_down"]["count"], 1)
+        self.assertEqual(snapshot[BATCH_FEEDER_PHASE]["list"]["count"], 1)
+        self.assertEqual(snapshot[RETRIEVAL_PHASE]["name"]["count"], 1)
+        self.assertEqual(snapshot[BATCH_RETRIEVAL_PHASE]["name"]["count"], 1)
+        self.assertEqual(snapshot[BATCH_TRANSFORMATION_PHASE]["name"]["count"], 1)
+
+    def test_descriptor_instrumentation(self):
+        instrumentation = Instrumentation()
+        descriptor = DataDescriptor("a", lambda s: s.count("a"), cache=LruCache(), instrumentation=instrumentation)
+        self.assertEqual(descriptor.data("abba"), 2)
+        self.assertEqual(descriptor.data("abba"), 2)
+        # the second call is served from the cache, so the algorithms are not called:
+        self.assertEqual(instrumentation.statistics(RETRIEVAL_PHASE, "a").count, 1)
+
+    def test_disabled(self):
+        instrumentation = Instrumentation()
+        instrumentation.enabled = False
+        collector = DataSetCollector(pass_arg_down, type_b_descriptors(("name", "age")),
+                                     instrumentation=instrumentation)
+        collector.data(self.string_list[0])
+        self.assertEqual(instrumentation.snapshot(), {})
+
+        instrumentation.enabled = True
+        collector.data(self.string_list[0])
+        instrumentation.reset()
+        self.assertEqual(instrumentation.snapshot(), {})
@@ -0,0 +1,160 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import pickle
+from unittest import TestCase
+from dataDescriptor import DataDescriptor
+from dataSetCollector import DataSetCollector, get_data_sets_based_on_string_list
+from lruCache import LruCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLruCache(TestCase):
+    def test_hits_and_misses(self):
+        cache = LruCache(max_size=2)
+        calls = []
+
+        def compute(value):
+            calls.append(value)
+            return value * 2
+
+        self.assertEqual(cache.get_or_compute("a", lambda: compute(1)), 2)
+        self.assertEqual(cache.get_or_compute("a", lambda: compute(5)), 2)
+        self.assertEqual(calls, [1])
+        self.assertEqual(cache.statistics(), {'hits': 1, 'misses': 1, 'evictions': 0, 'expirations': 0,
+                                              'uncacheable': 0, 'size': 1})
+
+    def test_lru_eviction(self):
+        cache = LruCache(max_size=2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("b", lambda: 2)
+        cache.get_or_compute("a", lambda: 1)  # "b" becomes the least recently used
+        cache.get_or_compute("c", lambda: 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.get_or_compute("a", lambda: 10), 1)
+        self.assertEqual(cache.get_or_compute("b", lambda: 20), 20)
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = LruCache(ttl=10, clock=clock)
+        cache.get_or_compute("a", lambda: 1)
+        clock.now = 9.9
+        self.assertEqual(cache.get_or_compute("a", lambda: 2), 1)
+        clock.now = 10
+        self.assertEqual(cache.get_or_compute("a", lambda: 3), 3)
+        self.assertEqual(cache.expirations, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_unhashable_key(self):
+        cache = LruCache()
+        self.assertEqual(cache.get_or_compute(([1],), lambda: 1), 1)
+        self.assertEqual(cache.get_or_compute(([1],), lambda: 2), 2)
+        self.assertEqual(cache.uncacheable, 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_get_or_compute_many(self):
+        cache = LruCache()
+        calls = []
+
+        def compute_missing(keys):
+            calls.append(keys)
+            return [key * 2 for key in keys]
+
+        cache.get_or_compute(2, lambda: 4)
+        self.assertEqual(cache.get_or_compute_many([1, 2, 3, 1], compute_missing), [2, 4, 6, 2])
+        self.assertEqual(calls, [[1, 3]])
+        self.assertEqual(cache.get_or_compute_many([3, 1], compute_missing), [6, 2])
+        self.assertEqual(calls, [[1, 3]])
+        self.assertEqual(cache.statistics(), {'hits': 4, 'misses': 3, 'evictions': 0, 'expirations': 0,
+                                              'uncacheable': 0, 'size': 3})
+
+        self.assertEqual(cache.get_or_compute_many([([1],), 1], lambda keys: ["computed"] * len(keys)),
+                         ["computed", 2])
+        self.assertEqual((cache.uncacheable, len(cache)), (1, 3))
+
+    def test_clear_and_pickle(self):
+        cache = LruCache()
+        cache.get_or_compute("a", lambda: 1)
+        cache = pickle.loads(pickle.dumps(cache))
+        self.assertEqual(cache.get_or_compute("a", lambda: 2), 1)
+        cache.clear()
+        self.assertEqual(cache.get_or_compute("a", lambda: 2), 2)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            LruCache(max_size=0)
+
+
+class TestMemoizedCollection(TestCase):
+    def test_descriptor_cache(self):
+        calls = []
+        descriptor = DataDescriptor("a", lambda s: calls.append(s) or s.count("a"), cache=LruCache())
+        self.assertEqual(descriptor.data("abba"), 2)
+        self.assertEqual(descriptor.data("abba"), 2)
+        self.assertEqual(descriptor.data("aaa"), 3)
+        self.assertEqual(calls, ["abba", "aaa"])
+        self.assertEqual(descriptor.cache.hits, 1)
+
+    def test_feeder_cache_shared_by_collectors(self):
+        feeds = []
+
+        def read_file(filepath: str):
+            feeds.append(filepath)
+            with open(filepath, 'r') as file:
+                return file.read()
+
+        feeder_cache = LruCache(max_size=16)
+        names = DataSetCollector(read_file, [DataDescriptor("name", lambda c: c.split("\n")[0])],
+                                 feeder_cache=feeder_cache)
+        ages = DataSetCollector(read_file, [DataDescriptor("age", lambda c: c.split("\n")[2])],
+                                feeder_cache=feeder_cache)
+
+        self.assertEqual(names.data("test/data/typeA/set1/data.txt"), {"name": "name: Adam"})
+        self.assertEqual(ages.data("test/data/typeA/set1/data.txt"), {"age": "age: 34"})
+        self.assertEqual(feeds, ["test/data/typeA/set1/data.txt"])
+
+    def test_repeated_locations(self):
+        feeds = []
+        descriptor_calls = []
+        string_list = ["test/data/typeB/set1", "test/data/typeB/set2"] * 5
+
+        def feeder(directory):
+            feeds.append(directory)
+            return directory
+
+        def read_name(directory):
+            descriptor_calls.append(directory)
+            with open(directory + "/name.txt", 'r') as file:
+                return file.read()
+
+        data = get_data_sets_based_on_string_list(string_list, feeder,
+                                                  [DataDescriptor("name", read_name, cache=LruCache())],
+                                                  feeder_cache=LruCache())
+        self.assertEqual([d["name"] for d in data], ["Adam", "Maja"] * 5)
+        self.assertEqual(len(feeds), 2)
+        self.assertEqual(len(descriptor_calls), 2)
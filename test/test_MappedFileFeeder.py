@@ -0,0 +1,84 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import os
+import tempfile
+from unittest import TestCase
+from dataDescriptor import DataDescriptor
+from dataSetCollector import DataSetCollector, get_data_sets_based_on_string_list
+from mappedFileFeeder import MappedFileFeeder, map_file, find_prefixed_line, index_prefixed_lines
+
+
+class TestMappedFileFeeder(TestCase):
+    def test_map_file(self):
+        buffer = map_file("test/data/typeA/set1/data.txt")
+        self.assertEqual(buffer[:10], b"name: Adam")
+        with self.assertRaises(TypeError):
+            buffer[0] = ord("x")
+        buffer.close()
+
+    def test_empty_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "empty.txt")
+            open(path, 'w').close()
+            self.assertEqual(map_file(path), b"")
+            self.assertIsNone(find_prefixed_line(map_file(path), b"name:"))
+            self.assertEqual(index_prefixed_lines(map_file(path)), {})
+
+    def test_find_prefixed_line(self):
+        buffer = b"name: Adam\r\nsurname: Nowak\nage: 34"
+        self.assertEqual(find_prefixed_line(buffer, b"name:"), b" Adam")
+        self.assertEqual(find_prefixed_line(buffer, b"surname:"), b" Nowak")
+        self.assertEqual(find_prefixed_line(buffer, b"age:"), b" 34")
+        self.assertIsNone(find_prefixed_line(buffer, b"ame:"))
+
+    def test_index_prefixed_lines(self):
+        buffer = b"header\nname: Adam\r\nname: Eve\n\nurl: http://x\nage:34\n"
+        self.assertEqual(index_prefixed_lines(buffer),
+                         {b"name": b"Adam", b"url": b"http://x", b"age": b"34"})
+
+    def test_type_a_scenario(self):
+        # the same results as the type A scenario reading the whole file into a str:
+        descriptors = [
+            DataDescriptor(name="name",
+                           data_retrieving_functor=lambda buffer: find_prefixed_line(buffer, b"name:")[1:].decode()),
+            DataDescriptor(name="surname",
+                           data_retrieving_functor=lambda buffer: find_prefixed_line(buffer, b"surname:")[1:].decode(),
+                           data_transformation_functor=lambda s: s.upper()),
+            DataDescriptor(name="age",
+                           data_retrieving_functor=lambda buffer: find_prefixed_line(buffer, b"age:")[1:],
+                           data_transformation_functor=int),
+        ]
+        collector = DataSetCollector(data_descriptors_feeder=MappedFileFeeder(), data_descriptors=descriptors)
+        self.assertEqual(collector.data("test/data/typeA/set1/data.txt"), {"name": "Adam", "surname": "NOWAK", "age": 34})
+        self.assertEqual(collector.data("test/data/typeA/set2/data.txt"), {"name": "Maja", "surname": "BEE", "age": 12})
+
+    def test_with_shared_index(self):
+        data = get_data_sets_based_on_string_list(
+            string_list=["test/data/typeA/set1", "test/data/typeA/set2"],
+            data_descriptors_feeder=MappedFileFeeder("data.txt"),
+            intermediates=[DataDescriptor(name="fields", data_retrieving_functor=index_prefixed_lines)],
+            data_descriptors=[
+                DataDescriptor(name=name, data_retrieving_functor=lambda fields, key=name: fields[key.encode()].decode(),
+                               dependencies=["fields"])
+                for name in ["name", "surname", "age"]
+            ])
+        self.assertEqual(data, [{"name": "Adam", "surname": "Nowak", "age": "34"},
+                                {"name": "Maja", "surname": "Bee", "age": "12"}])
@@ -0,0 +1,123 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import os
+import sqlite3
+import tempfile
+import threading
+from unittest import TestCase
+from dataDescriptor import DataDescriptor
+from dataSetCollector import DataSetCollector
+from resourcePool import ResourcePool
+
+
+class TestResourcePool(TestCase):
+    def test_reuse(self):
+        created = []
+        closed = []
+        with ResourcePool(lambda: created.append(len(created)) or len(created), max_size=2,
+                          closer=closed.append) as pool:
+            with pool.resource() as first:
+                with pool.resource() as second:
+                    self.assertEqual((first, second), (1, 2))
+            with pool.resource() as again:
+                self.assertIn(again, [1, 2])
+            self.assertEqual(pool.created, 2)
+        self.assertEqual(sorted(closed), [1, 2])
+        with self.assertRaises(RuntimeError):
+            pool.acquire()
+
+    def test_waits_for_released_resource(self):
+        pool = ResourcePool(object, max_size=1)
+        resource = pool.acquire()
+        acquired = []
+        thread = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        thread.start()
+        thread.join(0.1)
+        self.assertEqual(acquired, [])
+        pool.release(resource)
+        thread.join(5)
+        self.assertEqual(acquired, [resource])
+
+    def test_failing_factory(self):
+        def factory():
+            raise OSError("cannot connect")
+
+        pool = ResourcePool(factory, max_size=1)
+        for _ in range(2):
+            with self.assertRaises(OSError):
+                pool.acquire()
+        self.assertEqual(pool.created, 0)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            ResourcePool(object, max_size=0)
+
+
+class TestBatchedDatabaseScenario(TestCase):
+    """
+        Consider the following scenario:
+        Data sets are records of a database table, identified by their ids. A single query fetches a whole batch
+        of records, using a connection from a pool shared by all batches.
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.database = os.path.join(self.directory, "people.sqlite")
+        with sqlite3.connect(self.database) as connection:
+            connection.execute("CREATE TABLE people (id INTEGER PRIMARY KEY, name TEXT, surname TEXT, age INTEGER)")
+            connection.executemany("INSERT INTO people VALUES (?, ?, ?, ?)",
+                                   [(i, "name" + str(i), "surname" + str(i), i % 100) for i in range(1, 101)])
+        self.queries = []
+
+    def tearDown(self):
+        os.remove(self.database)
+        os.rmdir(self.directory)
+
+    def test_one_query_per_batch(self):
+        pool = ResourcePool(lambda: sqlite3.connect(self.database, check_same_thread=False), max_size=2,
+                            closer=lambda connection: connection.close())
+
+        def fetch_rows(ids):
+            with pool.resource() as connection:
+                query = "SELECT id, name, surname, age FROM people WHERE id IN (" + ",".join("?" * len(ids)) + ")"
+                self.queries.append(query)
+                rows = {row[0]: row for row in connection.execute(query, ids)}
+            return [rows[record_id] for record_id in ids]
+
+        def fetch_row(record_id):
+            return fetch_rows([record_id])[0]
+
+        descriptors = [
+            DataDescriptor(name="name", data_retrieving_functor=lambda row: row[1]),
+            DataDescriptor(name="surname", data_retrieving_functor=lambda row: row[2], data_transformation_functor=str.upper),
+            DataDescriptor(name="age", data_retrieving_functor=lambda row: row[3]),
+        ]
+        collector = DataSetCollector(data_descriptors_feeder=fetch_row, data_descriptors=descriptors,
+                                     batch_data_descriptors_feeder=fetch_rows)
+        with pool:
+            ids = list(range(100, 0, -1))
+            data = list(collector.iterate_data_in_batches(ids, batch_size=30))
+            self.assertEqual(len(self.queries), 4)
+            self.assertEqual(data[0], {"name": "name100", "surname": "SURNAME100", "age": 0})
+            self.assertEqual(data[99], {"name": "name1", "surname": "SURNAME1", "age": 1})
+
+            # the same as collecting set by set:
+            self.assertEqual(data[:3], [collector.data(record_id) for record_id in ids[:3]])
+            self.assertEqual(pool.created, 1)
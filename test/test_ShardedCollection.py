@@ -0,0 +1,180 @@
+#
+#    This file is distributed under MIT License.
+#    Copyright (c) 2020 draghan
+#    Permission is hereby granted, free of charge, to any person obtaining a copy
+#    of this software and associated documentation files (the "Software"), to deal
+#    in the Software without restriction, including without limitation the rights
+#    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#    copies of the Software, and to permit persons to whom the Software is
+#    furnished to do so, subject to the following conditions:
+#    The above copyright notice and this permission notice shall be included in all
+#    copies or substantial portions of the Software.
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#    SOFTWARE.
+#
+
+import socket
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+from unittest import TestCase
+from dataDescriptor import DataDescriptor
+from dataSetCollector import DataSetCollector
+from shardedCollection import shard_of, partition_locations, collect_shard, merge_shard_results, \
+    run_shard_worker, ShardCoordinator, collect_sharded
+from test.testHelpers import pass_arg_down
+
+
+def square(number: int):
+    return number * number
+
+
+def parity(number: int):
+    return "even" if number % 2 == 0 else "odd"
+
+
+def fail_on_thirteen(number: int):
+    if number == 13:
+        raise ValueError("unlucky number")
+    return number
+
+
+def number_descriptors():
+    return [
+        DataDescriptor(name="square", data_retrieving_functor=square),
+        DataDescriptor(name="parity", data_retrieving_functor=parity),
+    ]
+
+
+def expected_data_sets(locations):
+    return [{"square": square(number), "parity": parity(number)} for number in locations]
+
+
+class TestPartitioning(TestCase):
+    def test_shard_of(self):
+        locations = ["test/data/typeB/set" + str(number) for number in range(100)]
+        shards = [shard_of(location, 4) for location in locations]
+        self.assertEqual(shards, [shard_of(location, 4) for location in locations])
+        self.assertEqual(set(shards), {0, 1, 2, 3})
+        self.assertEqual(shard_of("test/data/typeB/set1", 1), 0)
+        with self.assertRaises(ValueError):
+            shard_of("test/data/typeB/set1", 0)
+
+    def test_partition_and_merge(self):
+        locations = list(range(50))
+        shards = partition_locations(locations, 3)
+        self.assertEqual(len(shards), 3)
+        self.assertEqual(sorted(index for shard in shards for index, _ in shard), locations)
+        for shard_number, shard in enumerate(shards):
+            for index, location in shard:
+                self.assertEqual((locations[index], shard_of(location, 3)), (location, shard_number))
+
+        collector = DataSetCollector(pass_arg_down, number_descriptors())
+        results = [collect_shard(collector, shard) for shard in reversed(shards)]
+        self.assertEqual(merge_shard_results(results, len(locations)), expected_data_sets(locations))
+
+        with self.assertRaises(ValueError):
+            merge_shard_results(results[1:], len(locations))
+        with self.assertRaises(ValueError):
+            merge_shard_results(results + results[:1])
+        with self.assertRaises(ValueError):
+            partition_locations(locations, 0)
+
+
+class TestShardCoordinator(TestCase):
+    def run_workers(self, coordinator: ShardCoordinator, count: int):
+        collector = DataSetCollector(pass_arg_down, number_descriptors())
+        workers = [threading.Thread(target=run_shard_worker, args=(coordinator.address, coordinator.authkey, collector))
+                   for _ in range(count)]
+        for worker in workers:
+            worker.start()
+        return workers
+
+    def test_workers(self):
+        locations = list(range(40))
+        with ShardCoordinator(partition_locations(locations, 8)).start() as coordinator:
+            workers = self.run_workers(coordinator, 3)
+            self.assertTrue(coordinator.wait(10))
+            self.assertEqual(coordinator.results(), expected_data_sets(locations))
+            # workers connecting after all of the shards are done are told to stop as well
+            for worker in workers:
+                worker.join(10)
+                self.assertFalse(worker.is_alive())
+
+    def test_misbehaving_clients(self):
+        locations = list(range(10))
+        coordinator = ShardCoordinator(partition_locations(locations, 2)).start()
+        # a peer dropping the connection in the middle of the handshake:
+        dropped = socket.create_connection(coordinator.address)
+        dropped.recv(256)
+        dropped.shutdown(socket.SHUT_WR)
+        # a peer sending garbage, a peer with a wrong key and a silent peer:
+        garbage = socket.create_connection(coordinator.address)
+        garbage.sendall(b"GET / HTTP/1.0\r\n\r\n")
+        with self.assertRaises(AuthenticationError):
+            Client(coordinator.address, authkey=b"wrong key")
+        silent = socket.create_connection(coordinator.address)
+
+        workers = self.run_workers(coordinator, 1)
+        self.assertTrue(coordinator.wait(10))
+        self.assertEqual(coordinator.results(), expected_data_sets(locations))
+        start = time.monotonic()
+        coordinator.close()
+        self.assertLess(time.monotonic() - start, 5)
+        workers[0].join(10)
+        for client in (dropped, garbage, silent):
+            client.close()
+
+    def test_requeue_shard_of_lost_worker(self):
+        locations = list(range(10))
+        with ShardCoordinator(partition_locations(locations, 2)).start() as coordinator:
+            lost = Client(coordinator.address, authkey=coordinator.authkey)
+            lost.send(("ready", 0))
+            self.assertEqual(lost.recv()[0], "shard")
+            lost.close()
+            self.run_workers(coordinator, 1)
+            self.assertTrue(coordinator.wait(10))
+            self.assertEqual(coordinator.results(), expected_data_sets(locations))
+
+    def test_failing_shard(self):
+        collector = DataSetCollector(pass_arg_down, [DataDescriptor(name="number",
+                                                                    data_retrieving_functor=fail_on_thirteen)])
+        with ShardCoordinator(partition_locations(range(20), 4)).start() as coordinator:
+            worker = threading.Thread(target=run_shard_worker,
+                                      args=(coordinator.address, coordinator.authkey, collector))
+            worker.start()
+            self.assertTrue(coordinator.wait(10))
+            with self.assertRaises(RuntimeError) as error:
+                coordinator.results()
+            self.assertIn("unlucky number", str(error.exception))
+        worker.join(10)
+
+    def test_no_shards(self):
+        with ShardCoordinator([]) as coordinator:
+            self.assertTrue(coordinator.wait(0))
+            self.assertEqual(coordinator.results(), [])
+
+
+class TestCollectSharded(TestCase):
+    def test_worker_processes(self):
+        locations = list(range(200))
+        data = collect_sharded(locations, pass_arg_down, number_descriptors(), shard_count=7, workers=3)
+        self.assertEqual(data, expected_data_sets(locations))
+
+    def test_collector_options(self):
+        data = collect_sharded([3, 4], pass_arg_down, number_descriptors(), workers=2,
+                               intermediates=[DataDescriptor(name="unused", data_retrieving_functor=square)])
+        self.assertEqual(data, expected_data_sets([3, 4]))
+
+    def test_failing_worker_process(self):
+        with self.assertRaises(RuntimeError):
+            collect_sharded(range(20), pass_arg_down,
+                            [DataDescriptor(name="number", data_retrieving_functor=fail_on_thirteen)], workers=2)
+        with self.assertRaises(ValueError):
+            collect_sharded(range(20), pass_arg_down, number_descriptors(), workers=-1)